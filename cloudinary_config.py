@@ -46,9 +46,9 @@ def configure_cloudinary():
         return False
 
 def upload_image_to_cloudinary(image_path, public_id=None):
-    """Upload an image to Cloudinary and return the URL"""
+    """Upload an image (file path or readable file object) to Cloudinary and return the URL"""
     try:
-        if not os.path.exists(image_path):
+        if isinstance(image_path, str) and not os.path.exists(image_path):
             print(f"[ERROR] Image file not found: {image_path}")
             return ""
         
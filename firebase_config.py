@@ -4,8 +4,15 @@ from firebase_admin import storage as fb_storage
 import os
 from datetime import datetime
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
+# Independent 500-write batches are committed in parallel, up to this many at once
+BATCH_COMMIT_WORKERS = 8
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -25,18 +32,18 @@ class FirebaseManager:
             if not firebase_admin._apps:
                 # Try Railway environment variables first
                 if self._try_railway_credentials():
-                    print("[OK] Firebase initialized with Railway environment variables")
+                    logger.info("Firebase initialized with Railway environment variables")
                 elif self._try_service_account_file():
-                    print("[OK] Firebase initialized with service account key file")
+                    logger.info("Firebase initialized with service account key file")
                 elif self._try_default_credentials():
-                    print("[OK] Firebase initialized with default credentials")
+                    logger.info("Firebase initialized with default credentials")
                 else:
-                    print("[ERROR] Failed to initialize Firebase with any method")
+                    logger.error("Failed to initialize Firebase with any method")
                     return
                 
                 # Initialize Firestore
                 self.db = firestore.client()
-                print("[OK] Firestore database connected")
+                logger.info("Firestore database connected")
                 
                 # Initialize Storage bucket
                 try:
@@ -50,9 +57,9 @@ class FirebaseManager:
                                     project_id = sa.get("project_id")
                                     if project_id:
                                         bucket_name = f"{project_id}.appspot.com"
-                                        print(f"[INFO] Inferred storage bucket from project ID: {bucket_name}")
+                                        logger.info("Inferred storage bucket from project ID: %s", bucket_name)
                         except Exception as e:
-                            print(f"[WARN] Could not infer bucket name from service account: {e}")
+                            logger.warning("Could not infer bucket name from service account: %s", e)
                             bucket_name = None
                     
                     if bucket_name:
@@ -60,32 +67,30 @@ class FirebaseManager:
                             self.bucket = fb_storage.bucket(bucket_name)
                             # Test access by building a blob (no network call here)
                             _ = self.bucket.blob("test.txt")
-                            print(f"[OK] Storage bucket configured: {bucket_name}")
+                            logger.info("Storage bucket configured: %s", bucket_name)
                         except Exception as storage_error:
-                            print(f"[WARN] Storage bucket '{bucket_name}' exists but is not accessible: {storage_error}")
-                            print("[TIP] This might be due to:")
-                            print("   - Storage not enabled in Firebase Console")
-                            print("   - Insufficient permissions")
-                            print("   - Billing plan limitations (Storage requires Blaze plan)")
-                            print("   - Network connectivity issues")
+                            logger.warning(
+                                "Storage bucket '%s' exists but is not accessible: %s "
+                                "(Storage not enabled in Firebase Console, insufficient permissions, "
+                                "billing plan limitations - Storage requires Blaze plan - or network issues)",
+                                bucket_name, storage_error,
+                            )
                             self.bucket = None
                     else:
-                        print("[WARN] Storage bucket not configured.")
-                        print("[TIP] To fix this:")
-                        print("   1. Set FIREBASE_STORAGE_BUCKET environment variable")
-                        print("   2. Or create a .env file with: FIREBASE_STORAGE_BUCKET=your-project-id.appspot.com")
-                        print("   3. Note: Firebase Storage requires a Blaze (paid) billing plan")
+                        logger.warning(
+                            "Storage bucket not configured. Set FIREBASE_STORAGE_BUCKET (environment or .env, "
+                            "e.g. your-project-id.appspot.com); Firebase Storage requires a Blaze (paid) billing plan"
+                        )
                         self.bucket = None
                 except Exception as e:
-                    print(f"[WARN] Failed to configure Storage bucket: {e}")
-                    print("[TIP] Storage will be disabled. Images will use Cloudinary instead.")
+                    logger.warning("Failed to configure Storage bucket, images will use Cloudinary instead: %s", e)
                     self.bucket = None
                 
             else:
                 # Use existing app
                 self.app = firebase_admin.get_app()
                 self.db = firestore.client()
-                print("[OK] Using existing Firebase app")
+                logger.info("Using existing Firebase app")
                 try:
                     bucket_name = os.getenv("FIREBASE_STORAGE_BUCKET")
                     if not bucket_name:
@@ -97,28 +102,27 @@ class FirebaseManager:
                                     project_id = sa.get("project_id")
                                     if project_id:
                                         bucket_name = f"{project_id}.appspot.com"
-                                        print(f"[INFO] Inferred storage bucket from project ID: {bucket_name}")
+                                        logger.info("Inferred storage bucket from project ID: %s", bucket_name)
                         except Exception as e:
-                            print(f"[WARN] Could not infer bucket name from service account: {e}")
+                            logger.warning("Could not infer bucket name from service account: %s", e)
                             bucket_name = None
                     
                     if bucket_name:
                         self.bucket = fb_storage.bucket(bucket_name)
-                        print(f"[OK] Storage bucket configured: {bucket_name}")
+                        logger.info("Storage bucket configured: %s", bucket_name)
                     else:
                         self.bucket = None
-                        print("[WARN] Storage bucket not configured")
+                        logger.warning("Storage bucket not configured")
                 except Exception as e:
-                    print(f"[WARN] Storage bucket not accessible: {e}")
+                    logger.warning("Storage bucket not accessible: %s", e)
                     self.bucket = None
                 
         except Exception as e:
-            print(f"[ERROR] Firebase initialization failed: {e}")
-            print("📋 Please ensure you have:")
-            print("   1. Installed firebase-admin: pip install firebase-admin")
-            print("   2. Set up Firebase project in Firebase Console")
-            print("   3. Downloaded serviceAccountKey.json or set GOOGLE_APPLICATION_CREDENTIALS")
-            print("   4. For Railway: Set Firebase environment variables in Railway dashboard")
+            logger.error(
+                "Firebase initialization failed: %s. Check that firebase-admin is installed, the Firebase project "
+                "exists, serviceAccountKey.json or GOOGLE_APPLICATION_CREDENTIALS is available, and on Railway "
+                "the Firebase environment variables are set", e,
+            )
             self.db = None
     
     def _try_railway_credentials(self):
@@ -135,7 +139,7 @@ class FirebaseManager:
             client_x509_cert_url = os.getenv("FIREBASE_CLIENT_X509_CERT_URL")
             
             if not all([project_id, private_key_id, private_key, client_email, client_id]):
-                print("[DEBUG] Railway Firebase environment variables not complete")
+                logger.debug("Railway Firebase environment variables not complete")
                 return False
             
             # Fix private key formatting (Railway might strip newlines)
@@ -157,11 +161,11 @@ class FirebaseManager:
             
             self.cred = credentials.Certificate(service_account_info)
             self.app = firebase_admin.initialize_app(self.cred)
-            print(f"[DEBUG] Railway Firebase credentials loaded for project: {project_id}")
+            logger.debug("Railway Firebase credentials loaded for project: %s", project_id)
             return True
             
         except Exception as e:
-            print(f"[DEBUG] Railway credentials failed: {e}")
+            logger.debug("Railway credentials failed: %s", e)
             return False
     
     def _try_service_account_file(self):
@@ -172,24 +176,24 @@ class FirebaseManager:
             if os.path.exists(service_account_path):
                 self.cred = credentials.Certificate(service_account_path)
                 self.app = firebase_admin.initialize_app(self.cred)
-                print(f"[DEBUG] Service account file loaded: {service_account_path}")
+                logger.debug("Service account file loaded: %s", service_account_path)
                 return True
             else:
-                print("[DEBUG] ServiceAccountKey.json file not found")
+                logger.debug("ServiceAccountKey.json file not found")
                 return False
                 
         except Exception as e:
-            print(f"[DEBUG] Service account file failed: {e}")
+            logger.debug("Service account file failed: %s", e)
             return False
     
     def _try_default_credentials(self):
         """Try to initialize Firebase using default credentials"""
         try:
             self.app = firebase_admin.initialize_app()
-            print("[DEBUG] Default credentials loaded")
+            logger.debug("Default credentials loaded")
             return True
         except Exception as e:
-            print(f"[DEBUG] Default credentials failed: {e}")
+            logger.debug("Default credentials failed: %s", e)
             return False
     
     def get_collection(self, collection_name):
@@ -205,14 +209,13 @@ class FirebaseManager:
         """
         try:
             if not self.bucket:
-                print("[WARN] Firebase Storage not available. Using Cloudinary for image uploads.")
-                print("[TIP] To enable Firebase Storage:")
-                print("   1. Set FIREBASE_STORAGE_BUCKET environment variable")
-                print("   2. Enable Storage in Firebase Console")
-                print("   3. Upgrade to Blaze (paid) billing plan if needed")
+                logger.warning(
+                    "Firebase Storage not available, using Cloudinary for image uploads. To enable it, set "
+                    "FIREBASE_STORAGE_BUCKET, enable Storage in Firebase Console and upgrade to the Blaze plan if needed"
+                )
                 return ""
             if not os.path.exists(local_path):
-                print(f"[ERROR] Local file not found: {local_path}")
+                logger.error("Local file not found: %s", local_path)
                 return ""
             blob = self.bucket.blob(destination_path)
             blob.upload_from_filename(local_path)
@@ -229,15 +232,16 @@ class FirebaseManager:
                     url = blob.generate_signed_url(expiration=60*60*24*365)
                 except Exception:
                     url = ""
-            print(f"[OK] Uploaded to Storage: gs://{self.bucket.name}/{destination_path}")
+            logger.debug("Uploaded to Storage: gs://%s/%s", self.bucket.name, destination_path)
             return str(url)
         except Exception as e:
             if "billing" in str(e).lower() or "upgrade" in str(e).lower():
-                print(f"[ERROR] Storage upload failed: {e}")
-                print("[TIP] To use Firebase Storage, upgrade to Blaze (paid) billing plan in Firebase Console")
-                print("   https://console.firebase.google.com/project/_/usage/details")
+                logger.error(
+                    "Storage upload failed: %s. Firebase Storage needs the Blaze (paid) billing plan: "
+                    "https://console.firebase.google.com/project/_/usage/details", e,
+                )
             else:
-                print(f"[ERROR] Storage upload failed: {e}")
+                logger.error("Storage upload failed: %s", e)
             return ""
     
     def add_document(self, collection_name, data):
@@ -248,22 +252,64 @@ class FirebaseManager:
                 data['created_at'] = datetime.now()
                 data['updated_at'] = datetime.now()
                 
-                # Add document to collection
-                doc_ref = self.db.collection(collection_name).add(data)
-                print(f"[OK] Document added to {collection_name} with ID: {doc_ref[1].id}")
-                return doc_ref[1].id
+                # Allocate the document ID first so it is stored on the document in the same write
+                doc_ref = self.db.collection(collection_name).document()
+                data['id'] = doc_ref.id
+                doc_ref.set(data)
+                logger.debug("Document added to %s with ID: %s", collection_name, doc_ref.id)
+                return doc_ref.id
             else:
-                print("[ERROR] Firebase not initialized")
+                logger.error("Firebase not initialized")
                 return None
         except Exception as e:
-            print(f"[ERROR] Error adding document: {e}")
+            logger.error("Error adding document: %s", e)
             return None
     
+    def new_document_id(self, collection_name):
+        """Allocate a document ID client-side without writing anything"""
+        if self.db:
+            return self.db.collection(collection_name).document().id
+        return None
+
+    def add_documents(self, entries, batch_size=500):
+        """Add several (collection_name, data) documents in batch commits of up to 500 writes
+
+        A data dict that already carries an 'id' is written under that ID.
+        Each batch is atomic, so up to 500 entries land together or not at
+        all. Returns the IDs of the documents whose batch committed, in entry
+        order, so after a partial failure the caller knows what was written.
+        """
+        if not self.db:
+            logger.error("Firebase not initialized")
+            return []
+        now = datetime.now()
+        doc_ids = []
+        for collection_name, data in entries:
+            # IDs are allocated client-side, so they are known before any batch commits
+            collection = self.db.collection(collection_name)
+            data['id'] = data.get('id') or collection.document().id
+            data['created_at'] = now
+            data['updated_at'] = now
+            doc_ids.append(data['id'])
+
+        def fill(batch, chunk):
+            for collection_name, data in chunk:
+                batch.set(self.db.collection(collection_name).document(data['id']), data)
+
+        chunks = [entries[start:start + batch_size] for start in range(0, len(entries), batch_size)]
+        results = self._commit_batches(chunks, fill, "adding")
+        committed_ids = [data['id'] for chunk, ok in zip(chunks, results) if ok for _, data in chunk]
+        if len(committed_ids) < len(doc_ids):
+            logger.error("Batch added %s of %s documents", len(committed_ids), len(doc_ids))
+        else:
+            logger.debug("Batch added %s documents", len(committed_ids))
+        return committed_ids
+
     def get_documents(self, collection_name, limit=100):
         """Get documents from Firestore collection with timeout"""
         try:
             if self.db:
-                print(f"[INFO] Querying {collection_name} collection...")
+                logger.debug("Querying %s collection...", collection_name)
                 docs = self.db.collection(collection_name).limit(limit).stream()
                 documents = []
                 count = 0
@@ -274,15 +320,59 @@ class FirebaseManager:
                     count += 1
                     if count >= limit:
                         break
-                print(f"[OK] Retrieved {len(documents)} documents from {collection_name}")
+                logger.debug("Retrieved %s documents from %s", len(documents), collection_name)
                 return documents
             else:
-                print("[ERROR] Firebase not initialized")
+                logger.error("Firebase not initialized")
                 return []
         except Exception as e:
-            print(f"[ERROR] Error getting documents from {collection_name}: {e}")
+            logger.error("Error getting documents from %s: %s", collection_name, e)
             return []
     
+    def get_document(self, collection_name, doc_id):
+        """Get a single document by ID, or None if it does not exist"""
+        try:
+            if self.db:
+                doc = self.db.collection(collection_name).document(doc_id).get()
+                if not doc.exists:
+                    return None
+                doc_data = doc.to_dict()
+                doc_data['id'] = doc.id
+                return doc_data
+            else:
+                logger.error("Firebase not initialized")
+                return None
+        except Exception as e:
+            logger.error("Error getting document %s from %s: %s", doc_id, collection_name, e)
+            return None
+
+    def stream_documents(self, collection_name, batch_size=500):
+        """Yield documents from a collection (or subcollection path) one page at a time
+
+        A failed page read is logged and re-raised, so callers never mistake
+        a partial stream for the whole collection.
+        """
+        if not self.db:
+            logger.error("Firebase not initialized")
+            return
+        try:
+            last_doc = None
+            while True:
+                query = self.db.collection(collection_name).limit(batch_size)
+                if last_doc is not None:
+                    query = query.start_after(last_doc)
+                docs = list(query.stream())
+                for doc in docs:
+                    doc_data = doc.to_dict()
+                    doc_data['id'] = doc.id
+                    yield doc_data
+                if len(docs) < batch_size:
+                    break
+                last_doc = docs[-1]
+        except Exception as e:
+            logger.error("Error streaming documents from %s: %s", collection_name, e)
+            raise
+
     def update_document(self, collection_name, doc_id, data):
         """Update a document in Firestore"""
         try:
@@ -293,30 +383,114 @@ class FirebaseManager:
                 # Update document
                 doc_ref = self.db.collection(collection_name).document(doc_id)
                 doc_ref.update(data)
-                print(f"[OK] Document {doc_id} updated in {collection_name}")
+                logger.debug("Document %s updated in %s", doc_id, collection_name)
                 return True
             else:
-                print("[ERROR] Firebase not initialized")
+                logger.error("Firebase not initialized")
                 return False
         except Exception as e:
-            print(f"[ERROR] Error updating document: {e}")
+            logger.error("Error updating document: %s", e)
             return False
     
+    def update_documents(self, updates, batch_size=500):
+        """Apply (collection_name, doc_id, data) updates in batch commits of up to 500 writes
+
+        Returns the number of documents updated.
+        """
+        if not self.db:
+            logger.error("Firebase not initialized")
+            return 0
+        now = datetime.now()
+
+        def fill(batch, chunk):
+            for collection_name, doc_id, data in chunk:
+                data['updated_at'] = now
+                batch.update(self.db.collection(collection_name).document(doc_id), data)
+
+        chunks = [updates[start:start + batch_size] for start in range(0, len(updates), batch_size)]
+        results = self._commit_batches(chunks, fill, "updating")
+        updated = sum(len(chunk) for chunk, ok in zip(chunks, results) if ok)
+        logger.debug("Batch updated %s documents", updated)
+        return updated
+
+    def _commit_batches(self, chunks, fill, action):
+        """Build one write batch per chunk with fill(batch, chunk) and commit them concurrently
+
+        Returns a list with True for each chunk whose commit succeeded.
+        """
+        def commit(chunk):
+            try:
+                batch = self.db.batch()
+                fill(batch, chunk)
+                batch.commit()
+                return True
+            except Exception as e:
+                logger.error("Error %s documents in batch: %s", action, e)
+                return False
+
+        if len(chunks) <= 1:
+            return [commit(chunk) for chunk in chunks]
+        with ThreadPoolExecutor(max_workers=min(BATCH_COMMIT_WORKERS, len(chunks))) as pool:
+            return list(pool.map(commit, chunks))
+
     def delete_document(self, collection_name, doc_id):
         """Delete a document from Firestore"""
         try:
             if self.db:
                 doc_ref = self.db.collection(collection_name).document(doc_id)
                 doc_ref.delete()
-                print(f"[OK] Document {doc_id} deleted from {collection_name}")
+                logger.debug("Document %s deleted from %s", doc_id, collection_name)
                 return True
             else:
-                print("[ERROR] Firebase not initialized")
+                logger.error("Firebase not initialized")
                 return False
         except Exception as e:
-            print(f"[ERROR] Error deleting document: {e}")
+            logger.error("Error deleting document: %s", e)
             return False
     
+    def delete_documents(self, doc_refs, batch_size=500):
+        """Delete (collection_path, doc_id) pairs in batch commits of up to 500 deletes
+
+        collection_path may be a subcollection path such as
+        'student_violations/<parent>/violation_history'. Returns a
+        (deleted_count, failed_count) tuple.
+        """
+        if not self.db:
+            logger.error("Firebase not initialized")
+            return 0, len(doc_refs)
+
+        def fill(batch, chunk):
+            for collection_path, doc_id in chunk:
+                batch.delete(self.db.collection(collection_path).document(doc_id))
+
+        chunks = [doc_refs[start:start + batch_size] for start in range(0, len(doc_refs), batch_size)]
+        results = self._commit_batches(chunks, fill, "deleting")
+        deleted = sum(len(chunk) for chunk, ok in zip(chunks, results) if ok)
+        failed = len(doc_refs) - deleted
+        logger.debug("Batch deleted %s documents (%s failed)", deleted, failed)
+        return deleted, failed
+
+    def update_and_delete_documents(self, collection_path, doc_id, data, doc_refs):
+        """Update one document and delete (collection_path, doc_id) pairs in a single atomic batch commit
+
+        Either every write lands or none does. Returns True on success.
+        """
+        try:
+            if self.db:
+                batch = self.db.batch()
+                batch.update(self.db.collection(collection_path).document(doc_id), data)
+                for delete_path, delete_id in doc_refs:
+                    batch.delete(self.db.collection(delete_path).document(delete_id))
+                batch.commit()
+                logger.debug("Document %s updated in %s and %s documents deleted", doc_id, collection_path, len(doc_refs))
+                return True
+            else:
+                logger.error("Firebase not initialized")
+                return False
+        except Exception as e:
+            logger.error("Error updating and deleting documents in batch: %s", e)
+            return False
+
     def search_documents(self, collection_name, field, value, limit=100):
         """Search documents by field value"""
         try:
@@ -329,17 +503,86 @@ class FirebaseManager:
                     documents.append(doc_data)
                 return documents
             else:
-                print("[ERROR] Firebase not initialized")
+                logger.error("Firebase not initialized")
                 return []
         except Exception as e:
-            print(f"[ERROR] Error searching documents: {e}")
+            logger.error("Error searching documents: %s", e)
             return []
-    
+
+    def query_documents(self, collection_name, filters, limit=100, order_by=None, descending=False):
+        """Query documents matching all (field, op, value) filters server-side (limit=None returns every match)"""
+        try:
+            if self.db:
+                query = self.db.collection(collection_name)
+                for field, op, value in filters:
+                    query = query.where(field, op, value)
+                if order_by:
+                    direction = firestore.Query.DESCENDING if descending else firestore.Query.ASCENDING
+                    query = query.order_by(order_by, direction=direction)
+                if limit:
+                    query = query.limit(limit)
+                documents = []
+                for doc in query.stream():
+                    doc_data = doc.to_dict()
+                    doc_data['id'] = doc.id
+                    documents.append(doc_data)
+                return documents
+            else:
+                logger.error("Firebase not initialized")
+                return []
+        except Exception as e:
+            logger.error("Error querying documents from %s: %s", collection_name, e)
+            return []
+
+    def query_collection_group(self, group_name, filters, limit=100):
+        """Query every subcollection named group_name across all parent documents (limit=None returns every match)"""
+        try:
+            if self.db:
+                query = self.db.collection_group(group_name)
+                for field, op, value in filters:
+                    query = query.where(field, op, value)
+                if limit:
+                    query = query.limit(limit)
+                documents = []
+                for doc in query.stream():
+                    doc_data = doc.to_dict()
+                    doc_data['id'] = doc.id
+                    doc_data['parent_doc_id'] = doc.reference.parent.parent.id
+                    documents.append(doc_data)
+                return documents
+            else:
+                logger.error("Firebase not initialized")
+                return []
+        except Exception as e:
+            logger.error("Error querying collection group %s: %s", group_name, e)
+            return []
+
+    def page_documents(self, collection_name, limit=40, start_after_id=None):
+        """Get one page of a collection in document-id order, starting after the given document id"""
+        try:
+            if self.db:
+                # Every document has an id, so unlike a field ordering this never skips documents
+                query = self.db.collection(collection_name).order_by(firestore.FieldPath.document_id())
+                if start_after_id:
+                    query = query.start_after({firestore.FieldPath.document_id(): start_after_id})
+                documents = []
+                for doc in query.limit(limit).stream():
+                    doc_data = doc.to_dict()
+                    doc_data['id'] = doc.id
+                    documents.append(doc_data)
+                return documents
+            else:
+                logger.error("Firebase not initialized")
+                return []
+        except Exception as e:
+            logger.error("Error paging documents from %s: %s", collection_name, e)
+            return []
+
     def get_subcollection_documents(self, collection_name, doc_id, subcollection_name, limit=100):
         """Get documents from a subcollection"""
         try:
             if self.db:
-                print(f"[INFO] Querying {collection_name}/{doc_id}/{subcollection_name} subcollection...")
+                logger.debug("Querying %s/%s/%s subcollection...", collection_name, doc_id, subcollection_name)
                 docs = self.db.collection(collection_name).document(doc_id).collection(subcollection_name).limit(limit).stream()
                 documents = []
                 count = 0
@@ -351,20 +594,20 @@ class FirebaseManager:
                     count += 1
                     if count >= limit:
                         break
-                print(f"[OK] Retrieved {len(documents)} documents from {collection_name}/{doc_id}/{subcollection_name}")
+                logger.debug("Retrieved %s documents from %s/%s/%s", len(documents), collection_name, doc_id, subcollection_name)
                 return documents
             else:
-                print("[ERROR] Firebase not initialized")
+                logger.error("Firebase not initialized")
                 return []
         except Exception as e:
-            print(f"[ERROR] Error getting subcollection documents: {e}")
+            logger.error("Error getting subcollection documents: %s", e)
             return []
     
     def get_all_subcollection_documents(self, collection_name, subcollection_name, limit=100):
         """Get all documents from a subcollection across all parent documents"""
         try:
             if self.db:
-                print(f"[INFO] Querying all {subcollection_name} subcollections under {collection_name}...")
+                logger.debug("Querying all %s subcollections under %s...", subcollection_name, collection_name)
                 all_documents = []
                 
                 # Get all parent documents
@@ -387,13 +630,13 @@ class FirebaseManager:
                             doc_data['student_id'] = parent_data.get('student_id', 'N/A')
                         all_documents.append(doc_data)
                 
-                print(f"[OK] Retrieved {len(all_documents)} documents from all {subcollection_name} subcollections")
+                logger.debug("Retrieved %s documents from all %s subcollections", len(all_documents), subcollection_name)
                 return all_documents
             else:
-                print("[ERROR] Firebase not initialized")
+                logger.error("Firebase not initialized")
                 return []
         except Exception as e:
-            print(f"[ERROR] Error getting all subcollection documents: {e}")
+            logger.error("Error getting all subcollection documents: %s", e)
             return []
     
     def delete_subcollection_document(self, collection_name, doc_id, subcollection_name, subcollection_doc_id):
@@ -402,13 +645,13 @@ class FirebaseManager:
             if self.db:
                 doc_ref = self.db.collection(collection_name).document(doc_id).collection(subcollection_name).document(subcollection_doc_id)
                 doc_ref.delete()
-                print(f"[OK] Document {subcollection_doc_id} deleted from {collection_name}/{doc_id}/{subcollection_name}")
+                logger.debug("Document %s deleted from %s/%s/%s", subcollection_doc_id, collection_name, doc_id, subcollection_name)
                 return True
             else:
-                print("[ERROR] Firebase not initialized")
+                logger.error("Firebase not initialized")
                 return False
         except Exception as e:
-            print(f"[ERROR] Error deleting subcollection document: {e}")
+            logger.error("Error deleting subcollection document: %s", e)
             return False
     
     def authenticate_user(self, username, password):
@@ -425,13 +668,14 @@ class FirebaseManager:
                         return user
                 return None
             else:
-                print("[ERROR] Firebase not initialized")
+                logger.error("Firebase not initialized")
                 return None
         except Exception as e:
-            print(f"[ERROR] Authentication error: {e}")
+            logger.error("Authentication error: %s", e)
             return None
 
-# Global Firebase manager instance
+# Global Firebase manager instance - its Firestore client (and gRPC channel) is
+# created once at import time and shared by every request thread
 firebase_manager = FirebaseManager()
 
 # Helper functions for easy access
@@ -443,22 +687,62 @@ def add_to_firebase(collection, data):
     """Add data to Firebase collection"""
     return firebase_manager.add_document(collection, data)
 
+def add_many_to_firebase(entries):
+    """Add several (collection, data) documents to Firebase in batch commits of up to 500 writes"""
+    return firebase_manager.add_documents(entries)
+
+def new_firebase_id(collection):
+    """Allocate a new document ID for a Firebase collection"""
+    return firebase_manager.new_document_id(collection)
+
 def get_from_firebase(collection, limit=100):
     """Get data from Firebase collection"""
     return firebase_manager.get_documents(collection, limit)
 
+def get_one_from_firebase(collection, doc_id):
+    """Get a single document from Firebase collection by ID"""
+    return firebase_manager.get_document(collection, doc_id)
+
+def stream_from_firebase(collection, batch_size=500):
+    """Iterate over a Firebase collection in batches without loading it all at once"""
+    return firebase_manager.stream_documents(collection, batch_size)
+
 def update_in_firebase(collection, doc_id, data):
     """Update data in Firebase collection"""
     return firebase_manager.update_document(collection, doc_id, data)
 
+def update_many_in_firebase(updates):
+    """Apply several (collection, doc_id, data) updates to Firebase in batch commits"""
+    return firebase_manager.update_documents(updates)
+
 def delete_from_firebase(collection, doc_id):
     """Delete data from Firebase collection"""
     return firebase_manager.delete_document(collection, doc_id)
 
+def delete_many_from_firebase(doc_refs):
+    """Delete several (collection_path, doc_id) documents from Firebase in batch commits"""
+    return firebase_manager.delete_documents(doc_refs)
+
+def update_and_delete_in_firebase(collection_path, doc_id, data, doc_refs):
+    """Update one Firebase document and delete (collection_path, doc_id) documents in one atomic batch"""
+    return firebase_manager.update_and_delete_documents(collection_path, doc_id, data, doc_refs)
+
 def search_in_firebase(collection, field, value, limit=100):
     """Search data in Firebase collection"""
     return firebase_manager.search_documents(collection, field, value, limit)
 
+def query_firebase(collection, filters, limit=100, order_by=None, descending=False):
+    """Query data in Firebase collection with one or more where filters"""
+    return firebase_manager.query_documents(collection, filters, limit, order_by, descending)
+
+def page_firebase(collection, limit=40, cursor=None):
+    """Get one page of a Firebase collection; pass the last id of the previous page as cursor"""
+    return firebase_manager.page_documents(collection, limit, cursor)
+
+def query_firebase_group(group_name, filters, limit=100):
+    """Query all subcollections with the given name across every parent document"""
+    return firebase_manager.query_collection_group(group_name, filters, limit)
+
 def get_from_subcollection(collection_name, doc_id, subcollection_name, limit=100):
     """Get data from Firebase subcollection"""
     return firebase_manager.get_subcollection_documents(collection_name, doc_id, subcollection_name, limit)
@@ -0,0 +1,23 @@
+"""Gunicorn settings for production (Railway): gunicorn web_server:app
+
+Data migrations run once per deployment from run_migrations.py, before gunicorn starts.
+"""
+import logging
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+# The data caches and their invalidation live in each worker process, so a second worker would
+# keep serving (and 304-confirming) lists the first one has already changed; scale with threads
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = 60
+keepalive = 5
+
+
+def post_worker_init(worker):
+    """Configure logging and start the health heartbeat in each worker"""
+    # Production logs warnings and errors only; set LOG_LEVEL=INFO or DEBUG to trace requests
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'WARNING').upper(), format="[%(levelname)s] %(message)s")
+    from web_server import start_background_tasks
+    start_background_tasks()
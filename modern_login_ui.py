@@ -125,11 +125,11 @@ def guidance_dashboard():
     # Calculate statistics
     stats = {
         'total_violations': len(violations),
-        'pending_violations': len([v for v in violations if v.get('status') == 'Pending']),
+        'pending_violations': sum(1 for v in violations if v.get('status') == 'Pending'),
         'total_appeals': len(appeals),
-        'pending_appeals': len([a for a in appeals if a.get('status') == 'Pending Review']),
+        'pending_appeals': sum(1 for a in appeals if a.get('status') == 'Pending Review'),
         'total_designs': len(designs),
-        'approved_designs': len([d for d in designs if d.get('status') == 'Approved'])
+        'approved_designs': sum(1 for d in designs if d.get('status') == 'Approved')
     }
     
     # Sort appeals: approved ones at the bottom, others by priority
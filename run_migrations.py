@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Run the one-shot data migrations for a deployment
+Railway runs this as the pre-deploy step (Procfile "release"), before gunicorn starts serving
+"""
+
+import logging
+import os
+import sys
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), format="[%(levelname)s] %(message)s")
+
+from web_server import run_migrations
+
+if __name__ == "__main__":
+    run_migrations()
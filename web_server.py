@@ -1,37 +1,185 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+from flask import Flask, Response, render_template, request, redirect, url_for, session, flash, jsonify, g
 from datetime import timedelta, datetime
 import hashlib
+import hmac
 from firebase_config import (
     get_from_firebase,
+    get_one_from_firebase,
     search_in_firebase,
+    query_firebase,
+    query_firebase_group,
+    page_firebase,
+    stream_from_firebase,
     add_to_firebase,
+    add_many_to_firebase,
+    new_firebase_id,
     update_in_firebase,
+    update_many_in_firebase,
+    update_and_delete_in_firebase,
     delete_from_firebase,
+    delete_many_from_firebase,
     firebase_manager,
     get_all_from_subcollection,
     delete_from_subcollection,
 )
-from cloudinary_config import upload_image_to_cloudinary
-import tempfile
+from cloudinary_config import cloudinary, upload_image_to_cloudinary
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import HTTPException, InternalServerError
+try:
+    import orjson
+except ImportError:  # optional: responses fall back to Flask's stdlib encoder
+    orjson = None
+try:
+    from flask_compress import Compress
+except ImportError:  # optional: pages are sent uncompressed
+    Compress = None
 import os
 import time
 import random
+import uuid
 import json
-from functools import lru_cache
-from threading import Lock
+import logging
+import re
+import unicodedata
+from functools import lru_cache, wraps
+from collections import Counter
+from itertools import chain, islice
+from threading import Lock, Thread
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import unquote
+
+logger = logging.getLogger(__name__)
 
 # Feature flags
 AUTO_CREATE_APPEALS = False  # Set to False to disable automatic appeal creation
 AUTO_DELETE_VIOLATIONS_ON_APPEAL_APPROVAL = True  # Set to False to disable automatic violation deletion when appeal is approved
 
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATE_FORMAT = '%Y-%m-%d'
+
+# Formatted wall-clock time, re-rendered at most once per second
+_timestamp_cache = (None, '')
+
+
+def current_timestamp():
+    """Return the current local time formatted with TIMESTAMP_FORMAT"""
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, formatted = _timestamp_cache
+    if cached_second != second:
+        formatted = datetime.fromtimestamp(second).strftime(TIMESTAMP_FORMAT)
+        _timestamp_cache = (second, formatted)
+    return formatted
+
+
+def current_date():
+    """Return the current local date formatted with DATE_FORMAT"""
+    return current_timestamp()[:10]
+
+
+# Status and priority values assigned when a record doesn't carry its own
+VIOLATION_STATUS_PENDING = 'Pending'
+APPEAL_STATUS_PENDING = 'Pending Review'
+DESIGN_STATUS_UNDER_REVIEW = 'Under Review'
+DEFAULT_PRIORITY = 'Medium'
+
+# Defaults applied to incoming documents when a field is missing or empty
+STUDENT_APPEAL_DEFAULTS = {'status': APPEAL_STATUS_PENDING, 'reason_type': 'Unexcused', 'priority': DEFAULT_PRIORITY}
+VIOLATION_DEFAULTS = {'severity': 'Medium'}
+
+# Fields the JSON APIs reject a payload without (tuples, so error messages list them in a stable order)
+VIOLATION_API_REQUIRED_FIELDS = ('student_name', 'student_id', 'violation_type', 'description')
+STUDENT_REQUIRED_FIELDS = ('name', 'student_number', 'course', 'gender', 'email', 'contact_number')
+
+
+# Page size for GET /api/violations?limit=N (without limit the endpoint keeps returning the merged list)
+VIOLATIONS_PAGE_SIZE = 40
+VIOLATIONS_PAGE_MAX = 500
+
+# Violations with the same student, date and description hash fetched for the duplicate check
+DUPLICATE_CANDIDATES = 5
+
+# Rapid re-submission guard for POST /api/violations
+RAPID_SUBMIT_SECONDS = 5
+RAPID_SUBMIT_CANDIDATES = 3
+
+
+def apply_defaults(data, defaults):
+    """Fill in defaults for keys that are missing or empty in data"""
+    data.update({key: value for key, value in defaults.items() if not data.get(key)})
+    return data
+
+_NON_SLUG_CHARS = re.compile(r'[^\w-]+')
+
+
+def slugify(text):
+    """Turn a display name into an ASCII, underscore-separated identifier"""
+    ascii_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return _NON_SLUG_CHARS.sub('_', ascii_text).strip('_')
+
+
+# Form fields for the violation, appeal and design pages (add and edit share them)
+VIOLATION_FORM_FIELDS = ("student_name", "student_id", "violation_type", "course", "date", "description")
+VIOLATION_REQUIRED_FIELDS = ("student_name", "student_id", "violation_type")
+APPEAL_FORM_FIELDS = ("student_name", "student_id", "violation_id", "appeal_date", "reason", "submitted_by")
+APPEAL_REQUIRED_FIELDS = ("student_name", "student_id", "violation_id")
+APPEAL_FORM_DEFAULTS = {"status": APPEAL_STATUS_PENDING, "priority": DEFAULT_PRIORITY}
+DESIGN_FORM_FIELDS = ("name", "type", "course", "colors", "submitted_date", "designer", "description")
+DESIGN_REQUIRED_FIELDS = ("name", "type")
+DESIGN_FORM_DEFAULTS = {"status": DESIGN_STATUS_UNDER_REVIEW}
+
+
+def merge_unique(*sources, link_field=None):
+    """Concatenate record lists, dropping a record that mirrors one from an earlier source
+
+    A record is a mirror when its id, or its link_field value, is the id of a record
+    already listed. Records within one source are never merged with each other.
+    """
+    merged = []
+    seen_ids = set()
+    for source in sources:
+        source_ids = []
+        for item in source:
+            refs = {item.get('id'), item.get(link_field) if link_field else None} - {None, ''}
+            if refs & seen_ids:
+                continue
+            merged.append(item)
+            source_ids.append(item.get('id'))
+        seen_ids.update(source_ids)
+    return merged
+
+
+def collect_form(fields, required=(), defaults=None):
+    """Read stripped form fields plus defaulted select fields; return (data, missing required fields)"""
+    data = {field: request.form.get(field, "").strip() for field in fields}
+    if defaults:
+        data.update({field: request.form.get(field, default) for field, default in defaults.items()})
+    return data, [field for field in required if not data[field]]
+
+
+def hash_password(password_bytes: bytes) -> bytes:
+    """Raw SHA-256 digest of an encoded password, compared against the users.txt hashes decoded at load time"""
+    return hashlib.sha256(password_bytes).digest()
 
 
 # Cache for Firebase data to improve performance
 _cache = {}
 _cache_lock = Lock()
 CACHE_DURATION = 10  # seconds (reduced for faster updates)
+CACHE_FETCH_TIMEOUT = 10  # seconds a request waits on another thread's refresh of the same key
+_cache_fetches = {}  # cache key -> Future of the refresh in flight, guarded by _cache_lock
+CACHE_MAX_ENTRIES = 2048  # remembered documents add one entry each, so the cache is bounded
+APPEALS_CACHE_KEY = "appeals_merged"
+APPEALS_CACHE_SOURCES = ("student_appeals", "appeals", "student_violations")  # collections the merged appeals list is built from
+VIOLATIONS_CACHE_KEY = "violations_merged"
+VIOLATIONS_CACHE_SOURCES = ("violations", "student_violations")  # collections the merged violations list is built from
+# The dashboard refetches /api/violations right after its own writes, so browsers must revalidate every time
+VIOLATIONS_CACHE_CONTROL = "no-cache"
+
+# Shared pool for running independent Firestore reads concurrently
+_io_pool = ThreadPoolExecutor(max_workers=8)
+# Cloudinary uploads are slow and bursty, so they get their own pool and never queue ahead of Firestore reads
+_upload_pool = ThreadPoolExecutor(max_workers=4)
 
 
 def get_cached_data(collection_name, limit=20):
@@ -43,15 +191,40 @@ def get_cached_data(collection_name, limit=20):
         if cache_key in _cache:
             data, timestamp = _cache[cache_key]
             if current_time - timestamp < CACHE_DURATION:
-                print(f"[CACHE] Using cached data for {collection_name}")
+                logger.debug("Using cached data for %s", collection_name)
                 return data
+        # Only one thread refreshes a key; the others wait for its result instead of querying Firebase too
+        pending = _cache_fetches.get(cache_key)
+        if pending is None:
+            fetch = _cache_fetches[cache_key] = Future()
+    
+    if pending is not None:
+        try:
+            return pending.result(timeout=CACHE_FETCH_TIMEOUT)
+        except Exception as e:
+            logger.warning("Waiting for %s refresh failed: %s", collection_name, e)
+            return get_sample_data(collection_name)
     
+    try:
+        data = fetch_for_cache(collection_name, limit, cache_key, current_time)
+        fetch.set_result(data)
+        return data
+    except Exception as e:
+        fetch.set_exception(e)
+        raise
+    finally:
+        with _cache_lock:
+            _cache_fetches.pop(cache_key, None)
+
+
+def fetch_for_cache(collection_name, limit, cache_key, current_time):
+    """Query Firebase for get_cached_data and store a non-empty result, falling back to sample data"""
     # Cache miss or expired - try Firebase with fallback to sample data
-    print(f"[REFRESH] Fetching fresh data for {collection_name}")
+    logger.debug("Fetching fresh data for %s", collection_name)
     
     # Try Firebase query with fallback to sample data
     try:
-        print(f"[SEARCH] Attempting Firebase query for {collection_name}...")
+        logger.debug("Attempting Firebase query for %s...", collection_name)
         
         # Use the original get_from_firebase function which works better
         data = get_from_firebase(collection_name, limit) or []
@@ -59,15 +232,15 @@ def get_cached_data(collection_name, limit=20):
         if data:
             with _cache_lock:
                 _cache[cache_key] = (data, current_time)
-            print(f"[OK] Firebase query successful for {collection_name}: {len(data)} items")
+                prune_cache(current_time)
+            logger.debug("Firebase query successful for %s: %s items", collection_name, len(data))
             return data
         else:
-            print(f"[WARN] No data found in {collection_name}, using sample data")
+            logger.warning("No data found in %s, using sample data", collection_name)
             return get_sample_data(collection_name)
             
     except Exception as e:
-        print(f"[ERROR] Firebase query failed for {collection_name}: {e}")
-        print(f"[REFRESH] Using sample data for {collection_name}")
+        logger.error("Firebase query failed for %s, using sample data: %s", collection_name, e)
         return get_sample_data(collection_name)
 
 
@@ -82,6 +255,52 @@ def get_sample_data(collection_name):
     return sample_data.get(collection_name, [])
 
 
+def format_history_violation(vh):
+    """Format a violation_history document as a row of the violations table"""
+    return {
+        'id': vh.get('id', ''),
+        'parent_doc_id': vh.get('parent_doc_id', ''),  # Store parent doc ID for deletion
+        'student_name': vh.get('student_name', vh.get('name', 'N/A')),
+        'student_id': vh.get('student_id', 'N/A'),
+        'violation_type': vh.get('violation_type', 'Uniform Violation'),
+        'course': vh.get('course', ''),
+        'date': vh.get('date', vh.get('created_at', '')),
+        'description': vh.get('description', 'Student violation'),
+        'status': vh.get('status', VIOLATION_STATUS_PENDING),
+        'reported_by': vh.get('reported_by', 'System'),
+        'severity': vh.get('severity', 'Medium'),
+        'last_updated': vh.get('last_updated', ''),  # Include last_updated from Firebase
+        'timestamp': vh.get('timestamp', vh.get('last_updated', vh.get('created_at', ''))),  # Include timestamp field
+        'created_at': vh.get('created_at', ''),
+        'last_missing_items': vh.get('last_missing_items', []),  # Include last_missing_items from Firebase
+        'missing_items': vh.get('missing_items', []),  # Include missing_items from Firebase
+        'violation_id': vh.get('violation_id', ''),  # violations document this entry mirrors, if any
+        'source': 'violation_history'  # Mark as coming from violation_history subcollection
+    }
+
+
+def format_history_appeal(vh):
+    """Format a violation_history document as a row of the appeals table"""
+    violation_id = vh.get('id', '')
+    reason = vh.get('appeal_reason', vh.get('reason', vh.get('description', 'Appeal for violation')))
+    return {
+        'id': violation_id,
+        'parent_doc_id': vh.get('parent_doc_id', ''),  # Store parent doc ID for reference
+        'student_name': vh.get('student_name', vh.get('name', 'N/A')),
+        'student_id': vh.get('student_id', 'N/A'),
+        'violation_id': violation_id,  # Use the same ID as violation_id
+        'appeal_date': vh.get('date', vh.get('appeal_date', vh.get('created_at', ''))),
+        'appeal_reason': reason,
+        'reason': reason,
+        'status': vh.get('appeal_status', vh.get('status', APPEAL_STATUS_PENDING)),
+        'approved_date': vh.get('approved_date', ''),  # Date when appeal was approved
+        'submitted_by': vh.get('submitted_by', vh.get('student_name', vh.get('name', 'Student'))),
+        'priority': vh.get('priority', DEFAULT_PRIORITY),
+        'reason_type': vh.get('reason_type', 'Unexcused'),
+        'source': 'violation_history'  # Mark as coming from violation_history subcollection
+    }
+
+
 def get_student_violations_from_firebase():
     """Fetch student violations from violation_history subcollection under student_violations"""
     try:
@@ -89,34 +308,12 @@ def get_student_violations_from_firebase():
         violation_history = get_all_from_subcollection("student_violations", "violation_history") or []
         
         # Format the data to match violations table structure
-        formatted_violations = []
-        for vh in violation_history:
-            # Extract data from violation_history subcollection
-            formatted_violation = {
-                'id': vh.get('id', ''),
-                'parent_doc_id': vh.get('parent_doc_id', ''),  # Store parent doc ID for deletion
-                'student_name': vh.get('student_name', vh.get('name', 'N/A')),
-                'student_id': vh.get('student_id', 'N/A'),
-                'violation_type': vh.get('violation_type', 'Uniform Violation'),
-                'course': vh.get('course', ''),
-                'date': vh.get('date', vh.get('created_at', '')),
-                'description': vh.get('description', 'Student violation'),
-                'status': vh.get('status', 'Pending'),
-                'reported_by': vh.get('reported_by', 'System'),
-                'severity': vh.get('severity', 'Medium'),
-                'last_updated': vh.get('last_updated', ''),  # Include last_updated from Firebase
-                'timestamp': vh.get('timestamp', vh.get('last_updated', vh.get('created_at', ''))),  # Include timestamp field
-                'created_at': vh.get('created_at', ''),
-                'last_missing_items': vh.get('last_missing_items', []),  # Include last_missing_items from Firebase
-                'missing_items': vh.get('missing_items', []),  # Include missing_items from Firebase
-                'source': 'violation_history'  # Mark as coming from violation_history subcollection
-            }
-            formatted_violations.append(formatted_violation)
+        formatted_violations = [format_history_violation(vh) for vh in violation_history]
         
-        print(f"[OK] Retrieved {len(formatted_violations)} violations from violation_history subcollection")
+        logger.debug("Retrieved %s violations from violation_history subcollection", len(formatted_violations))
         return formatted_violations
     except Exception as e:
-        print(f"[ERROR] Error fetching violation_history: {e}")
+        logger.error("Error fetching violation_history: %s", e)
         return []
 
 
@@ -135,7 +332,7 @@ def get_student_name_from_students_collection(student_id):
             return student_name.strip() if student_name else None
         return None
     except Exception as e:
-        print(f"[ERROR] Error fetching student name for student_id {student_id}: {e}")
+        logger.error("Error fetching student name for student_id %s: %s", student_id, e)
         return None
 
 
@@ -168,7 +365,7 @@ def get_uniform_violations_management_data():
                 'student_id': student_id,
                 'student_name': student_name,
                 'violation_type': vh.get('violation_type', 'Uniform Violation'),
-                'status': vh.get('status', 'Pending'),
+                'status': vh.get('status', VIOLATION_STATUS_PENDING),
                 'date': vh.get('date', vh.get('created_at', '')),
                 'last_updated': vh.get('last_updated', ''),
                 'missing_items': vh.get('missing_items', []),  # Include missing_items field
@@ -192,14 +389,7 @@ def get_uniform_violations_management_data():
             offense_count = len(violations)
             
             # Determine status based on offense count
-            if offense_count == 1:
-                status = 'Warning'
-            elif offense_count == 2:
-                status = 'Advisory'
-            elif offense_count >= 3:
-                status = 'Guidance'
-            else:
-                status = 'Warning'
+            status = status_for_count(offense_count)
             
             # Get latest violation type
             latest_violation = violations[-1]  # Assuming violations are in chronological order
@@ -214,12 +404,10 @@ def get_uniform_violations_management_data():
                 'violations': violations  # Store all violations for this student
             })
         
-        print(f"[OK] Retrieved {len(summary_data)} students with violations from violation_history")
+        logger.debug("Retrieved %s students with violations from violation_history", len(summary_data))
         return summary_data
     except Exception as e:
-        print(f"[ERROR] Error fetching uniform violations management data: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching uniform violations management data: %s", e)
         return []
 
 
@@ -230,38 +418,129 @@ def get_student_violations_as_appeals():
         violation_history = get_all_from_subcollection("student_violations", "violation_history") or []
         
         # Format the data to match appeals table structure
-        formatted_appeals = []
-        for vh in violation_history:
-            # Extract data from violation_history and format as appeal
-            formatted_appeal = {
-                'id': vh.get('id', ''),
-                'parent_doc_id': vh.get('parent_doc_id', ''),  # Store parent doc ID for reference
-                'student_name': vh.get('student_name', vh.get('name', 'N/A')),
-                'student_id': vh.get('student_id', 'N/A'),
-                'violation_id': vh.get('id', ''),  # Use the same ID as violation_id
-                'appeal_date': vh.get('date', vh.get('appeal_date', vh.get('created_at', ''))),
-                'appeal_reason': vh.get('appeal_reason', vh.get('reason', vh.get('description', 'Appeal for violation'))),
-                'reason': vh.get('appeal_reason', vh.get('reason', vh.get('description', 'Appeal for violation'))),
-                'status': vh.get('appeal_status', vh.get('status', 'Pending Review')),
-                'approved_date': vh.get('approved_date', ''),  # Date when appeal was approved
-                'submitted_by': vh.get('submitted_by', vh.get('student_name', vh.get('name', 'Student'))),
-                'priority': vh.get('priority', 'Medium'),
-                'reason_type': vh.get('reason_type', 'Unexcused'),
-                'source': 'violation_history'  # Mark as coming from violation_history subcollection
-            }
-            formatted_appeals.append(formatted_appeal)
+        formatted_appeals = [format_history_appeal(vh) for vh in violation_history]
         
-        print(f"[OK] Retrieved {len(formatted_appeals)} appeals from violation_history subcollection")
+        logger.debug("Retrieved %s appeals from violation_history subcollection", len(formatted_appeals))
         return formatted_appeals
     except Exception as e:
-        print(f"[ERROR] Error fetching violation_history as appeals: {e}")
+        logger.error("Error fetching violation_history as appeals: %s", e)
         return []
 
 
+def get_student_violations_and_appeals():
+    """Fetch violation_history once and return it formatted both as violations and as appeals"""
+    try:
+        violation_history = get_all_from_subcollection("student_violations", "violation_history") or []
+        
+        formatted_violations = []
+        formatted_appeals = []
+        for vh in violation_history:
+            formatted_violations.append(format_history_violation(vh))
+            formatted_appeals.append(format_history_appeal(vh))
+        
+        logger.debug("Retrieved %s violations and appeals from violation_history subcollection", len(violation_history))
+        return formatted_violations, formatted_appeals
+    except Exception as e:
+        logger.error("Error fetching violation_history: %s", e)
+        return [], []
+
+
+def content_etag(data):
+    """Hash JSON-serializable data into an ETag value"""
+    return hashlib.md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def etag_response(payload, etag, cache_control=None):
+    """Return payload as JSON, or an empty 304 if the client already holds this ETag"""
+    headers = {"Cache-Control": cache_control} if cache_control else {}
+    if etag in request.if_none_match:
+        return "", 304, {"ETag": f'"{etag}"', **headers}
+    response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers.update(headers)
+    return response
+
+
+def invalidate_cache(*collections, doc_id=None):
+    """Drop cached entries built from any of the given collections
+
+    With doc_id, only that document's single-document entry is dropped; list entries always go.
+    """
+    # Entries from get_cached_data are keyed "<collection>_<limit>", single documents
+    # "<collection>/<id>"; the merged appeals and violations lists are derived views of several collections
+    drop_appeals = any(collection in APPEALS_CACHE_SOURCES for collection in collections)
+    drop_violations = any(collection in VIOLATIONS_CACHE_SOURCES for collection in collections)
+    with _cache_lock:
+        stale_keys = [
+            key for key in _cache
+            if key.rsplit('_', 1)[0] in collections
+            or (key.split('/', 1)[0] in collections and (doc_id is None or key.split('/', 1)[-1] == doc_id))
+            or (drop_appeals and key == APPEALS_CACHE_KEY)
+            or (drop_violations and key == VIOLATIONS_CACHE_KEY)
+        ]
+        for key in stale_keys:
+            del _cache[key]
+
+
+def prune_cache(current_time):
+    """Keep _cache under CACHE_MAX_ENTRIES, dropping expired entries first and then the oldest; call with _cache_lock held"""
+    if len(_cache) <= CACHE_MAX_ENTRIES:
+        return
+    # Entries are (data, stored_at) except the merged appeals/violations lists, which are (data, expires_at, etag)
+    expired = [
+        key for key, entry in _cache.items()
+        if (entry[1] if len(entry) == 3 else entry[1] + CACHE_DURATION) <= current_time
+    ]
+    for key in expired:
+        del _cache[key]
+    # Still full of live entries: evict in insertion order down to 90% so the next inserts don't rescan
+    excess = len(_cache) - CACHE_MAX_ENTRIES * 9 // 10
+    if excess > 0:
+        for key in list(islice(_cache, excess)):
+            del _cache[key]
+
+
+def remember_documents(collection_name, items):
+    """Cache listed documents by id so the view/edit pages opened from the list skip a read"""
+    current_time = time.time()
+    with _cache_lock:
+        for item in items:
+            if 'id' in item:
+                _cache[f"{collection_name}/{item['id']}"] = (item, current_time)
+        prune_cache(current_time)
+
+
+def get_document_cached(collection_name, doc_id):
+    """Return a document remembered by a recent list page, else read it from Firebase"""
+    with _cache_lock:
+        cached = _cache.get(f"{collection_name}/{doc_id}")
+    if cached and time.time() - cached[1] < CACHE_DURATION:
+        return dict(cached[0])
+    return get_one_from_firebase(collection_name, doc_id)
+
+
 def clear_cache():
     """Clear the cache"""
+    global _cache
+    # Swap in an empty dict under the lock; the old entries are freed after it is released
     with _cache_lock:
-        _cache.clear()
+        stale_entries, _cache = _cache, {}
+    del stale_entries
+
+
+# Keyword tables for the simulated design uniqueness analysis
+COLOR_KEYWORDS = ('unique', 'vibrant', 'distinctive', 'bold', 'creative', 'innovative')
+STYLE_KEYWORDS = ('modern', 'innovative', 'unique', 'distinctive', 'creative', 'elegant', 'sophisticated')
+COLOR_KEYWORDS_RE = re.compile('|'.join(COLOR_KEYWORDS), re.IGNORECASE)
+STYLE_KEYWORDS_RE = re.compile('|'.join(STYLE_KEYWORDS), re.IGNORECASE)
+DESIGN_TYPE_BONUS = {'complete set': 20, 'blouse': 20, 'skirt': 15, 'shirt': 10, 'pants': 10}
+COLOR_FEATURES = (('gradient', "Gradient color transition"), ('metallic', "Metallic finish elements"))
+DESIGN_TYPE_FEATURES = {'complete set': "Coordinated complete uniform set", 'blouse': "Professional blouse design"}
+STYLE_FEATURES = (
+    ('modern', "Modern design approach"),
+    ('elegant', "Elegant styling"),
+    ('innovative', "Innovative design elements"),
+)
 
 
 def analyze_design_uniqueness(design_data):
@@ -271,180 +550,121 @@ def analyze_design_uniqueness(design_data):
     computer vision and machine learning models.
     """
     try:
-        # Simulate uniqueness analysis based on design characteristics
-        uniqueness_score = random.randint(60, 95)  # Simulated score 60-95%
-        
-        # Analyze different aspects
-        color_uniqueness = analyze_color_uniqueness(design_data.get('colors', ''))
-        pattern_uniqueness = analyze_pattern_uniqueness(design_data.get('type', ''))
-        style_uniqueness = analyze_style_uniqueness(design_data.get('description', ''))
-        
-        # Generate uniqueness annotations
-        annotations = []
-        
-        # Color analysis
-        if color_uniqueness['score'] > 80:
-            annotations.append({
-                'aspect': 'Color Scheme',
-                'score': color_uniqueness['score'],
-                'comment': color_uniqueness['comment'],
-                'uniqueness': 'High'
-            })
-        elif color_uniqueness['score'] > 60:
-            annotations.append({
-                'aspect': 'Color Scheme',
-                'score': color_uniqueness['score'],
-                'comment': color_uniqueness['comment'],
-                'uniqueness': 'Medium'
-            })
-        else:
-            annotations.append({
-                'aspect': 'Color Scheme',
-                'score': color_uniqueness['score'],
-                'comment': color_uniqueness['comment'],
-                'uniqueness': 'Low'
-            })
-        
-        # Pattern analysis
-        if pattern_uniqueness['score'] > 80:
-            annotations.append({
-                'aspect': 'Design Pattern',
-                'score': pattern_uniqueness['score'],
-                'comment': pattern_uniqueness['comment'],
-                'uniqueness': 'High'
-            })
-        elif pattern_uniqueness['score'] > 60:
-            annotations.append({
-                'aspect': 'Design Pattern',
-                'score': pattern_uniqueness['score'],
-                'comment': pattern_uniqueness['comment'],
-                'uniqueness': 'Medium'
-            })
-        else:
-            annotations.append({
-                'aspect': 'Design Pattern',
-                'score': pattern_uniqueness['score'],
-                'comment': pattern_uniqueness['comment'],
-                'uniqueness': 'Low'
-            })
-        
-        # Style analysis
-        if style_uniqueness['score'] > 80:
-            annotations.append({
-                'aspect': 'Style Innovation',
-                'score': style_uniqueness['score'],
-                'comment': style_uniqueness['comment'],
-                'uniqueness': 'High'
-            })
-        elif style_uniqueness['score'] > 60:
-            annotations.append({
-                'aspect': 'Style Innovation',
-                'score': style_uniqueness['score'],
-                'comment': style_uniqueness['comment'],
-                'uniqueness': 'Medium'
-            })
-        else:
-            annotations.append({
-                'aspect': 'Style Innovation',
-                'score': style_uniqueness['score'],
-                'comment': style_uniqueness['comment'],
-                'uniqueness': 'Low'
-            })
-        
-        # Overall uniqueness assessment
-        overall_score = sum(ann['score'] for ann in annotations) // len(annotations)
-        
-        if overall_score > 85:
-            overall_assessment = "Highly Unique"
-            recommendation = "This design stands out significantly and is recommended for approval."
-        elif overall_score > 70:
-            overall_assessment = "Moderately Unique"
-            recommendation = "This design has good uniqueness but could benefit from minor enhancements."
-        elif overall_score > 55:
-            overall_assessment = "Somewhat Unique"
-            recommendation = "Consider adding more distinctive elements to improve uniqueness."
-        else:
-            overall_assessment = "Low Uniqueness"
-            recommendation = "This design may be too similar to existing uniforms. Consider redesigning."
-        
+        analysis = analyze_uniqueness_cached(
+            design_data.get('colors', ''), design_data.get('type', ''), design_data.get('description', '')
+        )
+        # Copy the cached annotations so the caller can't alter what later designs get back
         return {
-            'overall_score': overall_score,
-            'overall_assessment': overall_assessment,
-            'recommendation': recommendation,
-            'annotations': annotations,
-            'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'unique_features': generate_unique_features(design_data)
+            **analysis,
+            'annotations': [dict(annotation) for annotation in analysis['annotations']],
+            'unique_features': list(analysis['unique_features']),
+            'analysis_date': current_timestamp(),
         }
         
     except Exception as e:
-        print(f"Error in uniqueness analysis: {e}")
+        logger.error("Error in uniqueness analysis: %s", e)
         return {
             'overall_score': 50,
             'overall_assessment': 'Analysis Failed',
             'recommendation': 'Unable to analyze uniqueness. Please try again.',
             'annotations': [],
-            'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'analysis_date': current_timestamp(),
             'unique_features': []
         }
 
 
+@lru_cache(maxsize=1024)
+def analyze_uniqueness_cached(colors, design_type, description):
+    """Uniqueness analysis without the timestamp; it depends only on these three fields, so it is memoized"""
+    # Score each aspect and build its annotation in one pass
+    annotations = [
+        {
+            'aspect': aspect,
+            'score': score,
+            'comment': comment,
+            'uniqueness': 'High' if score > 80 else 'Medium' if score > 60 else 'Low'
+        }
+        for aspect, (score, comment) in (
+            ('Color Scheme', analyze_color_uniqueness(colors)),
+            ('Design Pattern', analyze_pattern_uniqueness(design_type)),
+            ('Style Innovation', analyze_style_uniqueness(description)),
+        )
+    ]
+    
+    # Overall uniqueness assessment
+    overall_score = sum(ann['score'] for ann in annotations) // len(annotations)
+    
+    if overall_score > 85:
+        overall_assessment = "Highly Unique"
+        recommendation = "This design stands out significantly and is recommended for approval."
+    elif overall_score > 70:
+        overall_assessment = "Moderately Unique"
+        recommendation = "This design has good uniqueness but could benefit from minor enhancements."
+    elif overall_score > 55:
+        overall_assessment = "Somewhat Unique"
+        recommendation = "Consider adding more distinctive elements to improve uniqueness."
+    else:
+        overall_assessment = "Low Uniqueness"
+        recommendation = "This design may be too similar to existing uniforms. Consider redesigning."
+    
+    return {
+        'overall_score': overall_score,
+        'overall_assessment': overall_assessment,
+        'recommendation': recommendation,
+        'annotations': annotations,
+        'unique_features': generate_unique_features({'colors': colors, 'type': design_type, 'description': description})
+    }
+
+
 def analyze_color_uniqueness(colors):
-    """Analyze color scheme uniqueness"""
+    """Analyze color scheme uniqueness; returns (score, comment)"""
     if not colors:
-        return {'score': 30, 'comment': 'No color information provided'}
+        return 30, 'No color information provided'
     
-    color_keywords = ['unique', 'vibrant', 'distinctive', 'bold', 'creative', 'innovative']
+    colors_lower = colors.lower()
     color_score = 50
     
     # Check for unique color combinations
-    if any(keyword in colors.lower() for keyword in color_keywords):
+    if COLOR_KEYWORDS_RE.search(colors):
         color_score += 25
     
     # Check for specific color combinations
-    if 'gradient' in colors.lower():
+    if 'gradient' in colors_lower:
         color_score += 15
-    if 'metallic' in colors.lower():
+    if 'metallic' in colors_lower:
         color_score += 10
     if len(colors.split()) > 3:  # Multiple colors
         color_score += 10
     
-    return {
-        'score': min(color_score, 100),
-        'comment': f"Color scheme analysis: {colors}. {'Excellent color diversity' if color_score > 80 else 'Good color choices' if color_score > 60 else 'Consider more distinctive colors'}"
-    }
+    return (
+        min(color_score, 100),
+        f"Color scheme analysis: {colors}. {'Excellent color diversity' if color_score > 80 else 'Good color choices' if color_score > 60 else 'Consider more distinctive colors'}"
+    )
 
 
 def analyze_pattern_uniqueness(design_type):
-    """Analyze design pattern uniqueness"""
+    """Analyze design pattern uniqueness; returns (score, comment)"""
     if not design_type:
-        return {'score': 30, 'comment': 'No design type specified'}
-    
-    pattern_score = 60  # Base score
+        return 30, 'No design type specified'
     
-    # Different types have different uniqueness potential
-    if design_type.lower() in ['complete set', 'blouse']:
-        pattern_score += 20
-    elif design_type.lower() in ['shirt', 'pants']:
-        pattern_score += 10
-    elif design_type.lower() == 'skirt':
-        pattern_score += 15
+    # Base score plus the uniqueness potential of the design type
+    pattern_score = 60 + DESIGN_TYPE_BONUS.get(design_type.lower(), 0)
     
-    return {
-        'score': min(pattern_score, 100),
-        'comment': f"Design type '{design_type}' shows {'high' if pattern_score > 80 else 'moderate' if pattern_score > 60 else 'basic'} uniqueness potential"
-    }
+    return (
+        min(pattern_score, 100),
+        f"Design type '{design_type}' shows {'high' if pattern_score > 80 else 'moderate' if pattern_score > 60 else 'basic'} uniqueness potential"
+    )
 
 
 def analyze_style_uniqueness(description):
-    """Analyze style innovation uniqueness"""
+    """Analyze style innovation uniqueness; returns (score, comment)"""
     if not description:
-        return {'score': 40, 'comment': 'No description provided for style analysis'}
+        return 40, 'No description provided for style analysis'
     
-    style_keywords = ['modern', 'innovative', 'unique', 'distinctive', 'creative', 'elegant', 'sophisticated']
     style_score = 50
     
-    # Check for style-related keywords
-    keyword_count = sum(1 for keyword in style_keywords if keyword in description.lower())
+    # Check for style-related keywords (each distinct keyword counts once, in one scan)
+    keyword_count = len({match.lower() for match in STYLE_KEYWORDS_RE.findall(description)})
     style_score += keyword_count * 8
     
     # Check description length (more detailed descriptions often indicate more thought)
@@ -453,10 +673,10 @@ def analyze_style_uniqueness(description):
     if len(description) > 200:
         style_score += 5
     
-    return {
-        'score': min(style_score, 100),
-        'comment': f"Style analysis: {'Excellent innovation' if style_score > 80 else 'Good style elements' if style_score > 60 else 'Basic style approach'}"
-    }
+    return (
+        min(style_score, 100),
+        f"Style analysis: {'Excellent innovation' if style_score > 80 else 'Good style elements' if style_score > 60 else 'Basic style approach'}"
+    )
 
 
 def generate_unique_features(design_data):
@@ -464,30 +684,23 @@ def generate_unique_features(design_data):
     features = []
     
     # Color features
-    if design_data.get('colors'):
-        if 'gradient' in design_data['colors'].lower():
-            features.append("Gradient color transition")
-        if 'metallic' in design_data['colors'].lower():
-            features.append("Metallic finish elements")
-        if len(design_data['colors'].split()) > 2:
+    colors = design_data.get('colors')
+    if colors:
+        colors_lower = colors.lower()
+        features.extend(feature for keyword, feature in COLOR_FEATURES if keyword in colors_lower)
+        if len(colors.split()) > 2:
             features.append("Multi-color combination")
     
     # Type features
     if design_data.get('type'):
-        if design_data['type'].lower() == 'complete set':
-            features.append("Coordinated complete uniform set")
-        elif design_data['type'].lower() == 'blouse':
-            features.append("Professional blouse design")
+        type_feature = DESIGN_TYPE_FEATURES.get(design_data['type'].lower())
+        if type_feature:
+            features.append(type_feature)
     
     # Description features
     if design_data.get('description'):
         desc = design_data['description'].lower()
-        if 'modern' in desc:
-            features.append("Modern design approach")
-        if 'elegant' in desc:
-            features.append("Elegant styling")
-        if 'innovative' in desc:
-            features.append("Innovative design elements")
+        features.extend(feature for keyword, feature in STYLE_FEATURES if keyword in desc)
     
     # Default features if none identified
     if not features:
@@ -496,73 +709,60 @@ def generate_unique_features(design_data):
     return features
 
 
+def description_hash(description):
+    """Short hash of a normalized violation description, stored so duplicates can be found with a where() filter"""
+    return hashlib.blake2b(str(description or '').strip().lower().encode(), digest_size=8).hexdigest()
+
+
 def update_violation_in_firebase(violation_id, data):
     """Update violation in Firebase"""
     try:
+        if 'description' in data:
+            data['description_hash'] = description_hash(data['description'])
         return update_in_firebase("violations", violation_id, data)
     except Exception as e:
-        print(f"Error updating violation: {e}")
+        logger.error("Error updating violation: %s", e)
         return False
 
 
 def cleanup_student_document_if_no_violations(student_name, student_id):
     """Check if student has any remaining violations and delete all student documents if none exist"""
     try:
-        # Get all remaining violations from violation_history subcollection (fresh fetch after deletions)
-        violation_history = get_all_from_subcollection("student_violations", "violation_history") or []
+        # One remaining violation is enough to keep the documents, so each source is asked for at most one;
+        # violation_history stores the name under either field
+        remaining_queries = (
+            lambda: query_firebase_group("violation_history", [("student_id", "==", student_id), ("student_name", "==", student_name)], limit=1),
+            lambda: query_firebase_group("violation_history", [("student_id", "==", student_id), ("name", "==", student_name)], limit=1),
+            lambda: query_firebase("violations", [("student_id", "==", student_id), ("student_name", "==", student_name)], limit=1),
+        )
+        if any(query() for query in remaining_queries):
+            logger.info("Student %s still has violations - keeping documents", student_name)
+            return False
         
-        # Check if there are any remaining violations for this student in violation_history
-        remaining_violations = [
-            v for v in violation_history 
-            if (v.get('student_name') == student_name or v.get('name') == student_name) and 
-               v.get('student_id') == student_id
-        ]
+        # If no violations remain, delete all remaining student documents for this student
+        logger.info("No remaining violations for student %s (%s) - cleaning up all student documents", student_name, student_id)
         
-        # Also check violations collection
-        violations = get_from_firebase("violations") or []
-        remaining_violations.extend([
-            v for v in violations 
-            if v.get('student_name') == student_name and 
-               v.get('student_id') == student_id
-        ])
+        # Find all documents for this student that might still exist
+        # This catches any documents that weren't deleted in the previous step
+        student_documents_to_delete = [
+            v for v in query_firebase("student_violations", [("student_id", "==", student_id)], limit=None)
+            if v.get('name') == student_name or v.get('student_name') == student_name
+        ]
         
-        # If no violations remain, delete all remaining student documents for this student
-        if not remaining_violations:
-            print(f"[CLEANUP] No remaining violations for student {student_name} ({student_id}) - cleaning up all student documents")
-            
-            # Find all documents for this student that might still exist
-            # This catches any documents that weren't deleted in the previous step
-            all_student_docs = get_from_firebase("student_violations") or []
-            student_documents_to_delete = [
-                v for v in all_student_docs 
-                if (v.get('name') == student_name or v.get('student_name') == student_name) and 
-                   v.get('student_id') == student_id
-            ]
-            
-            # Delete all remaining student documents
-            deleted_count = 0
-            for doc in student_documents_to_delete:
-                doc_id = doc.get('id')
-                if doc_id:
-                    try:
-                        success = delete_from_firebase("student_violations", doc_id)
-                        if success:
-                            deleted_count += 1
-                            print(f"[CLEANUP] Deleted remaining student document {doc_id} for {student_name}")
-                    except Exception as e:
-                        print(f"[WARN] Error deleting student document {doc_id}: {e}")
-            
-            if deleted_count > 0:
-                print(f"[CLEANUP] Cleaned up {deleted_count} remaining student document(s) for {student_name}")
-                return True
-            else:
-                print(f"[CLEANUP] No remaining documents to clean up for {student_name}")
-        else:
-            print(f"[CLEANUP] Student {student_name} still has {len(remaining_violations)} violation(s) - keeping documents")
+        # Delete all remaining student documents in batch commits
+        deleted_count, failed_count = delete_many_from_firebase(
+            [("student_violations", doc['id']) for doc in student_documents_to_delete if doc.get('id')]
+        )
+        if failed_count:
+            logger.warning("Failed to delete %s student document(s) for %s", failed_count, student_name)
         
+        if deleted_count > 0:
+            logger.info("Cleaned up %s remaining student document(s) for %s", deleted_count, student_name)
+            return True
+        logger.info("No remaining documents to clean up for %s", student_name)
         return False
     except Exception as e:
-        print(f"[ERROR] Error cleaning up student documents: {e}")
+        logger.error("Error cleaning up student documents: %s", e)
         return False
 
 
@@ -577,48 +777,47 @@ def delete_violation_from_firebase(violation_id):
         
         # First, try to get violation info from violation_history subcollection
         try:
-            violation_history = get_all_from_subcollection("student_violations", "violation_history") or []
-            violation = next((v for v in violation_history if v.get('id') == violation_id), None)
+            matches = query_firebase_group("violation_history", [("id", "==", violation_id)], limit=1)
+            violation = matches[0] if matches else None
             if violation:
                 parent_doc_id = violation.get('parent_doc_id')
                 student_name = violation.get('student_name', violation.get('name'))
                 student_id = violation.get('student_id')
-                print(f"[INFO] Found violation {violation_id} in violation_history subcollection (parent: {parent_doc_id})")
+                logger.info("Found violation %s in violation_history subcollection (parent: %s)", violation_id, parent_doc_id)
         except Exception as e:
-            print(f"[WARN] Could not fetch from violation_history: {e}")
+            logger.warning("Could not fetch from violation_history: %s", e)
         
         # If not found in violation_history, try violations collection
         if not parent_doc_id:
             try:
-                violations = get_from_firebase("violations") or []
-                violation = next((v for v in violations if v.get('id') == violation_id), None)
+                violation = get_one_from_firebase("violations", violation_id)
                 if violation:
                     student_name = violation.get('student_name')
                     student_id = violation.get('student_id')
-                    print(f"[INFO] Found violation {violation_id} in violations collection")
+                    logger.info("Found violation %s in violations collection", violation_id)
             except Exception as e:
-                print(f"[WARN] Could not fetch from violations collection: {e}")
+                logger.warning("Could not fetch from violations collection: %s", e)
         
         # Try to delete from violation_history subcollection if found there
         if parent_doc_id:
             try:
                 deleted_from_violation_history = delete_from_subcollection("student_violations", parent_doc_id, "violation_history", violation_id)
                 if deleted_from_violation_history:
-                    print(f"[OK] Deleted violation {violation_id} from violation_history subcollection (parent: {parent_doc_id})")
+                    logger.info("Deleted violation %s from violation_history subcollection (parent: %s)", violation_id, parent_doc_id)
             except Exception as e:
-                print(f"[WARN] Error deleting from violation_history subcollection: {e}")
+                logger.warning("Error deleting from violation_history subcollection: %s", e)
         
         # Also try to delete from violations collection (in case it exists there too)
         try:
             deleted_from_violations = delete_from_firebase("violations", violation_id)
             if deleted_from_violations:
-                print(f"[OK] Deleted violation {violation_id} from violations collection")
+                logger.info("Deleted violation %s from violations collection", violation_id)
         except Exception as e:
-            print(f"[WARN] Error deleting from violations collection: {e}")
+            logger.warning("Error deleting from violations collection: %s", e)
         
         # Return True if deleted from at least one location
         if deleted_from_violations or deleted_from_violation_history:
-            print(f"[OK] Violation {violation_id} deleted successfully (violations: {deleted_from_violations}, violation_history: {deleted_from_violation_history})")
+            logger.info("Violation %s deleted successfully (violations: %s, violation_history: %s)", violation_id, deleted_from_violations, deleted_from_violation_history)
             
             # Clean up student document if no violations remain
             if student_name and student_id:
@@ -626,13 +825,25 @@ def delete_violation_from_firebase(violation_id):
             
             return True
         else:
-            print(f"[WARN] Violation {violation_id} not found in any collection or subcollection")
+            logger.warning("Violation %s not found in any collection or subcollection", violation_id)
             return False
     except Exception as e:
-        print(f"[ERROR] Error deleting violation: {e}")
+        logger.error("Error deleting violation: %s", e)
         return False
 
 
+# Fields copied as-is from student_appeals documents, with the value used when absent
+STUDENT_APPEAL_FIELD_DEFAULTS = {
+    'violation_id': '',
+    'status': APPEAL_STATUS_PENDING,
+    'approved_date': '',  # Date when appeal was approved
+    'priority': DEFAULT_PRIORITY,
+    'reason_type': 'Unexcused',
+    'created_at': '',
+    'updated_at': '',
+}
+
+
 def get_student_appeals_from_firebase():
     """Fetch student appeals from student_appeals collection"""
     try:
@@ -651,31 +862,23 @@ def get_student_appeals_from_firebase():
                 if student_name_from_db:
                     student_name = student_name_from_db
             
-            formatted_appeal = {
+            reason = appeal.get('appeal_reason', appeal.get('reason', ''))
+            formatted_appeals.append({
                 'id': appeal.get('id', ''),
                 'student_name': student_name,
                 'student_id': student_id,
-                'violation_id': appeal.get('violation_id', ''),
                 'appeal_date': appeal.get('appeal_date', appeal.get('date', '')),
-                'appeal_reason': appeal.get('appeal_reason', appeal.get('reason', '')),
-                'reason': appeal.get('appeal_reason', appeal.get('reason', '')),
-                'status': appeal.get('status', 'Pending Review'),
-                'approved_date': appeal.get('approved_date', ''),  # Date when appeal was approved
+                'appeal_reason': reason,
+                'reason': reason,
                 'submitted_by': appeal.get('submitted_by', appeal.get('student_name', 'Student')),
-                'priority': appeal.get('priority', 'Medium'),
-                'reason_type': appeal.get('reason_type', 'Unexcused'),
-                'created_at': appeal.get('created_at', ''),
-                'updated_at': appeal.get('updated_at', ''),
+                **{key: appeal.get(key, default) for key, default in STUDENT_APPEAL_FIELD_DEFAULTS.items()},
                 'source': 'student_appeals'  # Mark as coming from student_appeals collection
-            }
-            formatted_appeals.append(formatted_appeal)
+            })
         
-        print(f"[OK] Retrieved {len(formatted_appeals)} appeals from student_appeals collection")
+        logger.debug("Retrieved %s appeals from student_appeals collection", len(formatted_appeals))
         return formatted_appeals
     except Exception as e:
-        print(f"[ERROR] Error fetching student_appeals: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching student_appeals: %s", e)
         return []
 
 
@@ -684,7 +887,7 @@ def add_student_appeal_to_firebase(data):
     try:
         # Ensure required fields are present
         if 'student_id' not in data or not data.get('student_id'):
-            print("[ERROR] student_id is required for student_appeals")
+            logger.error("student_id is required for student_appeals")
             return None
         
         # Get student name from students collection if not provided
@@ -696,21 +899,16 @@ def add_student_appeal_to_firebase(data):
                 data['student_name'] = 'Unknown Student'
         
         # Set default values
-        if 'status' not in data or not data.get('status'):
-            data['status'] = 'Pending Review'
-        if 'reason_type' not in data or not data.get('reason_type'):
-            data['reason_type'] = 'Unexcused'
-        if 'priority' not in data or not data.get('priority'):
-            data['priority'] = 'Medium'
+        apply_defaults(data, STUDENT_APPEAL_DEFAULTS)
         
         # Add timestamp
-        from datetime import datetime
-        data['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        data['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = current_timestamp()
+        data['created_at'] = timestamp
+        data['updated_at'] = timestamp
         
         # Set approved_date only if status is Approved
         if data.get('status') == 'Approved' and ('approved_date' not in data or not data.get('approved_date')):
-            data['approved_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            data['approved_date'] = timestamp
         elif data.get('status') != 'Approved':
             # Clear approved_date if status is not Approved
             data['approved_date'] = ''
@@ -718,15 +916,13 @@ def add_student_appeal_to_firebase(data):
         # Add appeal to student_appeals collection
         doc_id = add_to_firebase("student_appeals", data)
         if doc_id:
-            print(f"[OK] Student appeal added to student_appeals collection with ID: {doc_id}")
+            logger.info("Student appeal added to student_appeals collection with ID: %s", doc_id)
             return doc_id
         else:
-            print(f"[ERROR] Failed to add student appeal to student_appeals collection")
+            logger.error("Failed to add student appeal to student_appeals collection")
             return None
     except Exception as e:
-        print(f"[ERROR] Error adding student appeal: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error adding student appeal: %s", e)
         return None
 
 
@@ -734,22 +930,20 @@ def update_appeal_in_firebase(appeal_id, data):
     """Update appeal in Firebase - checks both appeals and student_appeals collections"""
     try:
         # First check in student_appeals collection
-        student_appeals = get_from_firebase("student_appeals") or []
-        appeal = next((a for a in student_appeals if a.get('id') == appeal_id), None)
+        appeal = get_one_from_firebase("student_appeals", appeal_id)
         
         if appeal:
             # Update in student_appeals collection
-            from datetime import datetime
-            data['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            data['updated_at'] = current_timestamp()
             success = update_in_firebase("student_appeals", appeal_id, data)
             if success:
-                print(f"[OK] Appeal {appeal_id} updated in student_appeals collection")
+                logger.info("Appeal %s updated in student_appeals collection", appeal_id)
             return success
         else:
             # Fallback to appeals collection
             return update_in_firebase("appeals", appeal_id, data)
     except Exception as e:
-        print(f"Error updating appeal: {e}")
+        logger.error("Error updating appeal: %s", e)
         return False
 
 
@@ -760,31 +954,30 @@ def delete_appeal_from_firebase(appeal_id):
         deleted_from_appeals = False
         
         # First check in student_appeals collection
-        student_appeals = get_from_firebase("student_appeals") or []
-        appeal = next((a for a in student_appeals if a.get('id') == appeal_id), None)
+        appeal = get_one_from_firebase("student_appeals", appeal_id)
         
         if appeal:
             deleted_from_student_appeals = delete_from_firebase("student_appeals", appeal_id)
             if deleted_from_student_appeals:
-                print(f"[OK] Appeal {appeal_id} deleted from student_appeals collection")
+                logger.info("Appeal %s deleted from student_appeals collection", appeal_id)
         
         # Also try to delete from appeals collection (in case it exists there too)
         try:
             deleted_from_appeals = delete_from_firebase("appeals", appeal_id)
             if deleted_from_appeals:
-                print(f"[OK] Appeal {appeal_id} deleted from appeals collection")
+                logger.info("Appeal %s deleted from appeals collection", appeal_id)
         except Exception as e:
-            print(f"[WARN] Error deleting from appeals collection: {e}")
+            logger.warning("Error deleting from appeals collection: %s", e)
         
         # Return True if deleted from at least one location
         if deleted_from_student_appeals or deleted_from_appeals:
-            print(f"[OK] Appeal {appeal_id} deleted successfully (student_appeals: {deleted_from_student_appeals}, appeals: {deleted_from_appeals})")
+            logger.info("Appeal %s deleted successfully (student_appeals: %s, appeals: %s)", appeal_id, deleted_from_student_appeals, deleted_from_appeals)
             return True
         else:
-            print(f"[WARN] Appeal {appeal_id} not found in any collection")
+            logger.warning("Appeal %s not found in any collection", appeal_id)
             return False
     except Exception as e:
-        print(f"[ERROR] Error deleting appeal: {e}")
+        logger.error("Error deleting appeal: %s", e)
         return False
 
 
@@ -793,129 +986,281 @@ def update_design_in_firebase(design_id, data):
     try:
         return update_in_firebase("uniform_designs", design_id, data)
     except Exception as e:
-        print(f"Error updating design: {e}")
+        logger.error("Error updating design: %s", e)
         return False
 
 
+# Offense count -> status: 1st offense = Warning, 2nd = Advisory, 3rd+ = Guidance
+_VIOLATION_STATUS = ('Warning', 'Warning', 'Advisory')
+
+
+def status_for_count(violation_count):
+    """Map a student's violation count to its status"""
+    return 'Guidance' if violation_count >= 3 else _VIOLATION_STATUS[violation_count]
+
+
 def get_violation_status_by_count(student_name, student_id):
     """Determine violation status based on violation count for a student"""
     try:
-        # Get all violations for this student
-        violations = get_from_firebase("violations") or []
-        student_violations = [v for v in violations if v.get('student_name') == student_name and v.get('student_id') == student_id]
-        
-        violation_count = len(student_violations)
-        
-        # New status logic based on offense count:
-        # 1st offense = Warning
-        # 2nd offense = Advisory  
-        # 3rd+ offense = Guidance
-        if violation_count == 1:
-            return 'Warning'
-        elif violation_count == 2:
-            return 'Advisory'
-        elif violation_count >= 3:
-            return 'Guidance'
-        else:
-            return 'Warning'  # Default fallback
+        # The status stops changing at 3 violations, so at most 3 need to be read
+        student_violations = query_firebase(
+            "violations",
+            [("student_id", "==", student_id), ("student_name", "==", student_name)],
+            limit=3
+        )
+        
+        return status_for_count(len(student_violations))
         
     except Exception as e:
-        print(f"Error calculating violation status: {e}")
+        logger.error("Error calculating violation status: %s", e)
         return 'Warning'  # Default fallback
 
 
 def update_all_violation_statuses():
     """Update all existing violations to have correct status based on count"""
     try:
-        violations = get_from_firebase("violations") or []
-        updated_count = 0
-        
-        # Group violations by student
-        student_violations = {}
-        for violation in violations:
-            student_key = f"{violation.get('student_name', '')}_{violation.get('student_id', '')}"
-            if student_key not in student_violations:
-                student_violations[student_key] = []
-            student_violations[student_key].append(violation)
-        
-        # Update status for each student's violations
-        for student_key, student_viols in student_violations.items():
-            violation_count = len(student_viols)
-            if violation_count == 1:
-                new_status = 'Warning'
-            elif violation_count == 2:
-                new_status = 'Advisory'
-            elif violation_count >= 3:
-                new_status = 'Guidance'
-            else:
-                new_status = 'Warning'
-            
-            # Update each violation for this student
-            for violation in student_viols:
-                if violation.get('status') != new_status:
-                    violation_id = violation.get('id')
-                    if violation_id:
-                        update_data = {'status': new_status}
-                        if update_violation_in_firebase(violation_id, update_data):
-                            updated_count += 1
-                            print(f"Updated violation {violation_id} status to {new_status}")
-        
-        print(f"Updated {updated_count} violations with new status logic")
+        # Count every violation per student; the count needs the whole collection, not the first page.
+        # A failed read raises before anything is written, so partial counts never downgrade statuses
+        violations = [
+            (violation.get('id'), violation.get('status'), (violation.get('student_name', ''), violation.get('student_id', '')))
+            for violation in stream_from_firebase("violations")
+        ]
+        student_counts = Counter(student_key for _, _, student_key in violations)
+        new_statuses = {student_key: status_for_count(count) for student_key, count in student_counts.items()}
+        
+        # Collect the status changes and write them in batch commits instead of one update per violation
+        updates = [
+            ("violations", violation_id, {'status': new_statuses[student_key]})
+            for violation_id, status, student_key in violations
+            if violation_id and status != new_statuses[student_key]
+        ]
+        
+        updated_count = update_many_in_firebase(updates) if updates else 0
+        logger.info("Updated %s violations with new status logic", updated_count)
         return updated_count
         
     except Exception as e:
-        print(f"Error updating violation statuses: {e}")
+        logger.error("Error updating violation statuses: %s", e)
+        return 0
+
+
+def backfill_appeal_reason_type():
+    """Give legacy appeals without a reason_type the default 'Unexcused' (run once at startup)"""
+    try:
+        # Missing fields can't be matched by a where() filter, so walk the collection once
+        updates = [
+            ("appeals", appeal['id'], {'reason_type': 'Unexcused'})
+            for appeal in stream_from_firebase("appeals")
+            if not appeal.get('reason_type')
+        ]
+        if not updates:
+            return 0
+        logger.info("Updating %s appeals with default reason_type", len(updates))
+        updated_count = update_many_in_firebase(updates)
+        invalidate_cache("appeals")
+        return updated_count
+    except Exception as e:
+        logger.warning("Failed to backfill appeal reason_type: %s", e)
+        return 0
+
+
+def backfill_violation_history_ids():
+    """Store each violation_history document's ID in its 'id' field (run once at startup)"""
+    if not firebase_manager.db:
+        return 0
+    try:
+        # Only the 'id' field is projected, so documents missing it come back empty
+        docs = firebase_manager.db.collection_group("violation_history").select(['id']).stream()
+        updates = [
+            (doc.reference.parent.path, doc.id, {'id': doc.id})
+            for doc in docs
+            if not (doc.to_dict() or {}).get('id')
+        ]
+        if not updates:
+            return 0
+        logger.info("Storing id on %s violation_history documents", len(updates))
+        return update_many_in_firebase(updates)
+    except Exception as e:
+        logger.warning("Failed to backfill violation_history ids: %s", e)
+        return 0
+
+
+def backfill_violation_description_hash():
+    """Store description_hash on violations written before the duplicate check used it (run once at startup)"""
+    try:
+        updates = [
+            ("violations", violation['id'], {'description_hash': description_hash(violation.get('description'))})
+            for violation in stream_from_firebase("violations")
+            if not violation.get('description_hash')
+        ]
+        if not updates:
+            return 0
+        logger.info("Storing description_hash on %s violations", len(updates))
+        return update_many_in_firebase(updates)
+    except Exception as e:
+        logger.warning("Failed to backfill violation description_hash: %s", e)
+        return 0
+
+
+def backfill_violation_student_names():
+    """Trim student_name/student_id on violations saved before the POST stripped them (run once at startup)"""
+    try:
+        updates = []
+        for violation in stream_from_firebase("violations"):
+            trimmed = {
+                field: violation[field].strip()
+                for field in ('student_name', 'student_id')
+                if isinstance(violation.get(field), str) and violation[field] != violation[field].strip()
+            }
+            if trimmed:
+                updates.append(("violations", violation['id'], trimmed))
+        if not updates:
+            return 0
+        logger.info("Trimming student names on %s violations", len(updates))
+        updated_count = update_many_in_firebase(updates)
+        invalidate_cache("violations")
+        return updated_count
+    except Exception as e:
+        logger.warning("Failed to backfill violation student names: %s", e)
         return 0
 
 
+def run_migrations():
+    """Run the one-shot data migrations; call once per deployment, not once per worker"""
+    backfill_appeal_reason_type()
+    backfill_violation_history_ids()
+    backfill_violation_description_hash()
+    backfill_violation_student_names()
+
+
+def start_background_tasks():
+    """Start this process's health heartbeat (the health cache is per process, so every worker needs one)"""
+    Thread(target=health_heartbeat, name="health-heartbeat", daemon=True).start()
+
+
 def delete_design_from_firebase(design_id):
     """Delete design from Firebase"""
     try:
         return delete_from_firebase("uniform_designs", design_id)
     except Exception as e:
-        print(f"Error deleting design: {e}")
+        logger.error("Error deleting design: %s", e)
         return False
 
 
 app = Flask(__name__)
-app.secret_key = "replace-this-with-a-secure-secret-key"
+app.secret_key = os.environ.get('SECRET_KEY', "replace-this-with-a-secure-secret-key")
 app.permanent_session_lifetime = timedelta(hours=8)
 
+if Compress is not None:
+    # Only HTML pages; JSON responses keep their own ETags for 304 revalidation
+    app.config["COMPRESS_MIMETYPES"] = ["text/html"]
+    Compress(app)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Encode responses with orjson, keeping Flask's sorted keys and HTTP-date datetimes"""
+    option = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def response(self, *args, **kwargs):
+        # orjson already produces bytes, so skip the str round trip dumps() needs
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=self.option), mimetype=self.mimetype)
+
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Debug endpoints that write real documents are off unless explicitly enabled
+ENABLE_TEST_ENDPOINTS = os.environ.get('ENABLE_TEST_ENDPOINTS') == '1'
+
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Log any exception a view let escape; API callers get the usual {"error": ...} body"""
+    if isinstance(e, HTTPException):
+        return e
+    logger.exception("Unhandled error on %s: %s", request.path, e)
+    if request.path.startswith("/api/"):
+        return {"error": str(e), "debug": "unhandled"}, 500
+    return InternalServerError(original_exception=e)
+
 
 @app.context_processor
 def inject_globals():
     return {"app_name": "AI-niform"}
 
 
+def login_required(view):
+    """Require a logged-in user; the session user is read once and exposed as g.user and g.user_name"""
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        g.user = session.get("user")
+        if not g.user:
+            if request.path.startswith("/api/"):
+                return {"error": "Unauthorized"}, 401
+            return redirect(url_for("login"))
+        g.user_name = g.user.get("name", "Guidance")
+        return view(*args, **kwargs)
+    return wrapped
+
+
 @app.route("/")
 def root():
     return redirect(url_for("login"))
 
 
-def load_local_users():
-    """Load users from local users.txt file"""
+USERS_FILE = "users.txt"
+_users_cache = {"mtime": None, "data": {}}
+_users_lock = Lock()
+
+
+def parse_local_users():
+    """Parse users.txt into a dict keyed by username"""
     users = {}
+    with open(USERS_FILE, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                parts = line.split(",")
+                if len(parts) >= 5:
+                    username, password_hash, user_type, name, status = parts[:5]
+                    try:
+                        password_hash_bytes = bytes.fromhex(password_hash)
+                    except ValueError:
+                        logger.warning("Skipping user %s: password hash is not hex", username)
+                        continue
+                    users[username] = {
+                        "username": username,
+                        "password_hash": password_hash,
+                        "password_hash_bytes": password_hash_bytes,  # decoded once for the login comparison
+                        "role": user_type,
+                        "full_name": name,
+                        "status": status,
+                        "id": username  # Use username as ID for local users
+                    }
+    return users
+
+
+def load_local_users():
+    """Load users from local users.txt file, re-parsing it only when its mtime changes"""
     try:
-        with open("users.txt", "r") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    parts = line.split(",")
-                    if len(parts) >= 5:
-                        username, password_hash, user_type, name, status = parts[:5]
-                        users[username] = {
-                            "username": username,
-                            "password_hash": password_hash,
-                            "role": user_type,
-                            "full_name": name,
-                            "status": status,
-                            "id": username  # Use username as ID for local users
-                        }
+        mtime = os.stat(USERS_FILE).st_mtime_ns
+        if mtime == _users_cache["mtime"]:
+            return _users_cache["data"]
+        with _users_lock:
+            # Another thread may have re-parsed the file while this one waited
+            if mtime != _users_cache["mtime"]:
+                _users_cache["data"] = parse_local_users()
+                _users_cache["mtime"] = mtime
+            return _users_cache["data"]
     except FileNotFoundError:
-        print("users.txt file not found")
+        logger.warning("users.txt file not found")
     except Exception as e:
-        print(f"Error loading users.txt: {e}")
-    return users
+        logger.error("Error loading users.txt: %s", e)
+    return {}
 
 
 @app.route("/login", methods=["GET", "POST"])
@@ -924,7 +1269,7 @@ def login():
         username = request.form.get("username", "").strip()
         password = request.form.get("password", "")
         
-        print(f"[LOGIN] Login attempt: {username}")
+        logger.debug("Login attempt: %s", username)
 
         if not username or not password:
             flash("Please enter both username and password", "error")
@@ -937,13 +1282,13 @@ def login():
             local_users = load_local_users()
             user = local_users.get(username)
             if user:
-                print(f"[OK] User found locally: {username}")
+                logger.debug("User found locally: %s", username)
         except Exception as e:
-            print(f"[ERROR] Error loading local users: {e}")
+            logger.error("Error loading local users: %s", e)
         
         # Only try Firebase if not found locally (skip for now to speed up login)
         if not user:
-            print(f"[WARN] User {username} not found locally, skipping Firebase search for faster login")
+            logger.warning("User %s not found locally, skipping Firebase search for faster login", username)
             # try:
             #     print(f"[SEARCH] Searching Firebase for user: {username}")
             #     user_records = search_in_firebase("users", "username", username) or []
@@ -954,24 +1299,24 @@ def login():
             #     print(f"[ERROR] Error searching Firebase users: {e}")
 
         if not user:
-            print(f"[ERROR] User not found: {username}")
+            logger.warning("User not found: %s", username)
             flash("Invalid username or password", "error")
             return render_template("login.html")
 
-        # Verify password
-        password_hash = hash_password(password)
-        if password_hash != user.get("password_hash"):
-            print(f"[ERROR] Invalid password for user: {username}")
+        # Verify password (constant-time comparison of the raw digests)
+        password_hash = hash_password(password.encode('utf-8'))
+        if not hmac.compare_digest(password_hash, user.get("password_hash_bytes", b"")):
+            logger.warning("Invalid password for user: %s", username)
             flash("Invalid username or password", "error")
             return render_template("login.html")
 
         if (user.get("status") or "ACTIVE") != "ACTIVE":
-            print(f"[ERROR] Account deactivated: {username}")
+            logger.warning("Account deactivated: %s", username)
             flash("Account is deactivated. Please contact administrator.", "error")
             return render_template("login.html")
 
         # Login OK → put minimal user in session
-        print(f"[OK] Login successful: {username}")
+        logger.debug("Login successful: %s", username)
         session.permanent = True
         user_role = user.get("role", "guidance")
         session["user"] = {
@@ -992,38 +1337,32 @@ def login():
 
 
 @app.route("/loading")
+@login_required
 def loading():
     """Loading page that redirects to dashboard"""
-    if not require_login():
-        return redirect(url_for("login"))
-    
     # Redirect to dashboard after a short delay
     return render_template("loading.html")
 
 @app.route("/admin/add-sample-data")
+@login_required
 def add_sample_data_to_firebase():
     """Admin route to add sample data to Firebase"""
-    if not session.get("user"):
-        return redirect(url_for("login"))
-    
     try:
         # Add sample violations (empty for clean display)
         violations = []
         
-        for violation in violations:
-            add_to_firebase('violations', violation)
-        
         # Add sample appeals (empty for clean display)
         appeals = []
         
-        for appeal in appeals:
-            add_to_firebase('appeals', appeal)
-        
         # Add sample designs (empty for clean display)
         designs = []
         
-        for design in designs:
-            add_to_firebase('uniform_designs', design)
+        # Write everything through concurrent batch commits rather than one round-trip per document
+        entries = [('violations', violation) for violation in violations]
+        entries.extend(('appeals', appeal) for appeal in appeals)
+        entries.extend(('uniform_designs', design) for design in designs)
+        if entries:
+            add_many_to_firebase(entries)
         
         # Clear cache to force refresh
         clear_cache()
@@ -1037,14 +1376,12 @@ def add_sample_data_to_firebase():
 
 
 @app.route("/admin/update-violation-statuses")
+@login_required
 def admin_update_violation_statuses():
     """Admin route to update all violation statuses based on new logic"""
-    if not session.get("user"):
-        return redirect(url_for("login"))
-    
     try:
         updated_count = update_all_violation_statuses()
-        clear_cache()  # Clear cache to force refresh
+        invalidate_cache("violations")  # Clear cache to force refresh
         flash(f"Updated {updated_count} violations with new status logic!", "success")
         return redirect(url_for("dashboard"))
         
@@ -1054,64 +1391,89 @@ def admin_update_violation_statuses():
 
 # API Routes for AJAX requests
 @app.route("/api/violations", methods=["GET", "POST"])
+@login_required
 def api_violations():
     """API endpoint to get all violations or add a new violation"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
+    if request.method == "GET" and "limit" in request.args:
+        # Paged mode: one page of the violations collection, resumed from the previous page's next_cursor
+        limit = min(max(request.args.get("limit", VIOLATIONS_PAGE_SIZE, type=int), 1), VIOLATIONS_PAGE_MAX)
+        page = page_firebase("violations", limit, request.args.get("cursor") or None)
+        next_cursor = page[-1]["id"] if len(page) == limit else None
+        return {"success": True, "data": page, "next_cursor": next_cursor}, 200
+
     if request.method == "GET":
-        try:
-            # Get all violations from Firebase
-            violations = get_from_firebase("violations") or []
-            # Get student violations from student_violations collection
-            student_violations = get_student_violations_from_firebase()
-            
-            # Merge both collections
-            all_violations = violations + student_violations
-            
-            print(f"[API] GET /api/violations returning {len(all_violations)} violations (from violations: {len(violations)}, from violation_history: {len(student_violations)})")
-            return {"success": True, "data": all_violations}, 200
-        except Exception as e:
-            print(f"[ERROR] GET /api/violations failed: {e}")
-            return {"error": str(e)}, 500
+        # Serve the merged list from cache so unchanged polls can be answered with a 304
+        current_time = time.time()
+        with _cache_lock:
+            cached = _cache.get(VIOLATIONS_CACHE_KEY)
+        if cached and current_time < cached[1]:
+            logger.debug("Using cached data for violations")
+            return etag_response({"success": True, "data": cached[0]}, cached[2], VIOLATIONS_CACHE_CONTROL)
+
+        # Fetch violations and violation_history concurrently
+        violations_future = _io_pool.submit(get_from_firebase, "violations")
+        student_violations_future = _io_pool.submit(get_student_violations_from_firebase)
+        violations = violations_future.result() or []
+        student_violations = student_violations_future.result()
+        
+        # Merge both collections in place (the JSON response needs a concrete list anyway)
+        violations_count = len(violations)
+        all_violations = violations
+        all_violations.extend(student_violations)
+        
+        logger.debug("GET /api/violations returning %s violations (from violations: %s, from violation_history: %s)", len(all_violations), violations_count, len(student_violations))
+
+        etag = content_etag(all_violations)
+        with _cache_lock:
+            _cache[VIOLATIONS_CACHE_KEY] = (all_violations, current_time + CACHE_DURATION, etag)
+            prune_cache(current_time)
+
+        return etag_response({"success": True, "data": all_violations}, etag, VIOLATIONS_CACHE_CONTROL)
 
     elif request.method == "POST":
         try:
-            print(f"[API] POST /api/violations - Starting violation creation")
+            logger.debug("POST /api/violations - Starting violation creation")
             
             # Check Firebase connection first
             if not firebase_manager.db:
-                print(f"[ERROR] Firebase not initialized - cannot add violation")
+                logger.error("Firebase not initialized - cannot add violation")
                 return {"error": "Database connection failed. Please check Firebase configuration.", "debug": "firebase_not_initialized"}, 500
             
             data = request.get_json()
             if not data:
-                print(f"[ERROR] No data provided in request")
+                logger.warning("No data provided in request")
                 return {"error": "No data provided"}, 400
             
-            print(f"[DEBUG] Received violation data: {data}")
+            # The delete and duplicate checks match names exactly, so they are stored trimmed
+            for field in ('student_name', 'student_id'):
+                if isinstance(data.get(field), str):
+                    data[field] = data[field].strip()
+            
+            logger.debug("Received violation data: %s", data)
+            
+            # Single clock read shared by every timestamp written for this violation
+            now = datetime.now()
+            timestamp = now.strftime(TIMESTAMP_FORMAT)
             
             # Validate required fields
-            required_fields = ['student_name', 'student_id', 'violation_type', 'description']
-            missing_fields = [field for field in required_fields if not data.get(field)]
+            missing_fields = [field for field in VIOLATION_API_REQUIRED_FIELDS if not data.get(field)]
             if missing_fields:
-                print(f"[ERROR] Missing required fields: {missing_fields}")
+                logger.warning("Missing required fields: %s", missing_fields)
                 return {"error": f"Missing required fields: {', '.join(missing_fields)}"}, 400
             
             # Add current date automatically if not provided
             if 'date' not in data or not data['date']:
-                from datetime import datetime
-                data['date'] = datetime.now().strftime('%Y-%m-%d')
-                print(f"[DEBUG] Added default date: {data['date']}")
+                data['date'] = now.strftime(DATE_FORMAT)
+                logger.debug("Added default date: %s", data['date'])
             
             # Add unique timestamp to prevent race conditions
-            from datetime import datetime
-            data['created_timestamp'] = datetime.now().isoformat()
-            print(f"[DEBUG] Added timestamp: {data['created_timestamp']}")
+            data['created_timestamp'] = now.isoformat()
+            data['created_epoch'] = now.timestamp()  # numeric copy so the rapid-submit check can range-filter server-side
+            data['description_hash'] = description_hash(data['description'])
+            logger.debug("Added timestamp: %s", data['created_timestamp'])
             
-            # Set default values for severity and status
-            if 'severity' not in data or not data['severity']:
-                data['severity'] = 'Medium'
+            # Set default values for severity (status is derived from the offense count below)
+            apply_defaults(data, VIOLATION_DEFAULTS)
             
             # Check for duplicate violations (same student, same description, same date)
             student_name = data.get('student_name', '')
@@ -1120,65 +1482,74 @@ def api_violations():
             violation_date = data.get('date', '')
             created_timestamp = data.get('created_timestamp', '')
             
-            print(f"[DEBUG] Checking for duplicates - Student: {student_name}, ID: {student_id}, Date: {violation_date}")
+            logger.debug("Checking for duplicates - Student: %s, ID: %s, Date: %s", student_name, student_id, violation_date)
             
             if student_name and student_id and description and violation_date:
                 try:
-                    # Get existing violations to check for duplicates
-                    print(f"[DEBUG] Fetching existing violations for duplicate check")
-                    existing_violations = get_from_firebase("violations") or []
-                    print(f"[DEBUG] Found {len(existing_violations)} existing violations")
-                    
-                    # Check for exact duplicates (same student, description, date)
-                    duplicate_check = [
-                        v for v in existing_violations 
-                        if (v.get('student_name') == student_name and 
-                            v.get('student_id') == student_id and 
-                            v.get('description', '').strip().lower() == description.strip().lower() and
-                            v.get('date') == violation_date)
-                    ]
-                    
+                    # Exact duplicates (same student, description, date) are matched server-side on the description hash
+                    logger.debug("Querying same-day violations with this description for duplicate check")
+                    same_description_violations = query_firebase(
+                        "violations",
+                        [("student_id", "==", student_id), ("date", "==", violation_date), ("description_hash", "==", data['description_hash'])],
+                        limit=DUPLICATE_CANDIDATES,
+                    )
+                    duplicate_check = [v for v in same_description_violations if v.get('student_name') == student_name]
+
                     if duplicate_check:
-                        print(f"[WARN] Duplicate violation found for {student_name}")
+                        logger.warning("Duplicate violation found for %s", student_name)
                         return {"error": "A violation with the same description already exists for this student on this date", "duplicate": True}, 409
-                    
+
                     # Check for rapid duplicate submissions (within 5 seconds)
                     if created_timestamp:
-                        from datetime import datetime, timedelta
-                        current_time = datetime.now()
-                        recent_violations = [
-                            v for v in existing_violations 
-                            if (v.get('student_name') == student_name and 
-                                v.get('student_id') == student_id and
-                                v.get('created_timestamp'))
-                        ]
-                        
-                        for violation in recent_violations:
-                            try:
-                                violation_time = datetime.fromisoformat(violation.get('created_timestamp', ''))
-                                if (current_time - violation_time).total_seconds() < 5:
-                                    print(f"[WARN] Rapid duplicate submission detected for {student_name}")
-                                    return {"error": "Please wait before submitting another violation for this student", "duplicate": True}, 429
-                            except:
-                                continue
+                        # Firestore returns only this student's submissions inside the window
+                        recent_violations = query_firebase(
+                            "violations",
+                            [("student_id", "==", student_id), ("created_epoch", ">=", data['created_epoch'] - RAPID_SUBMIT_SECONDS)],
+                            limit=RAPID_SUBMIT_CANDIDATES,
+                        )
+                        if any(v.get('student_name') == student_name for v in recent_violations):
+                            logger.warning("Rapid duplicate submission detected for %s", student_name)
+                            return {"error": "Please wait before submitting another violation for this student", "duplicate": True}, 429
                 except Exception as e:
-                    print(f"[WARN] Error checking duplicates: {e}")
+                    logger.warning("Error checking duplicates: %s", e)
                     # Continue with creation even if duplicate check fails
             
             # Determine status based on violation count for this student
             try:
                 if student_name and student_id:
                     data['status'] = get_violation_status_by_count(student_name, student_id)
-                    print(f"[DEBUG] Calculated status: {data['status']}")
+                    logger.debug("Calculated status: %s", data['status'])
                 else:
                     data['status'] = 'Warning'  # Fallback if no student info
             except Exception as e:
-                print(f"[WARN] Error calculating status: {e}")
+                logger.warning("Error calculating status: %s", e)
                 data['status'] = 'Warning'
             
             # Add violation to Firebase
-            print(f"[DEBUG] Attempting to add violation to Firebase")
-            doc_id = add_to_firebase("violations", data)
+            logger.debug("Attempting to add violation to Firebase")
+            appeal_created = False
+            if AUTO_CREATE_APPEALS:
+                # Write the violation and its automatic appeal in one atomic batch commit
+                doc_id = new_firebase_id("violations")
+                data['id'] = doc_id
+                appeal_data = {
+                    'student_name': data.get('student_name', ''),
+                    'student_id': data.get('student_id', ''),
+                    'violation_id': doc_id,
+                    'appeal_reason': 'Automatic appeal created for violation',
+                    'status': APPEAL_STATUS_PENDING,
+                    'submitted_date': data.get('date', ''),
+                    'submitted_by': data.get('student_name', 'Student'),
+                    'created_automatically': True
+                }
+                doc_ids = add_many_to_firebase([("violations", data), ("appeals", appeal_data)])
+                if doc_ids:
+                    appeal_created = True
+                    logger.info("Auto-created appeal %s for violation %s", doc_ids[1], doc_id)
+                else:
+                    doc_id = None
+            else:
+                doc_id = add_to_firebase("violations", data)
             
             # Also add to student_violations/violation_history for management table
             student_id = data.get('student_id', '').strip()
@@ -1200,12 +1571,12 @@ def api_violations():
                             parent_data = {
                                 'student_id': student_id,
                                 'student_name': student_name,
-                                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                                'created_at': timestamp,
+                                'updated_at': timestamp
                             }
                             parent_doc_ref = student_violations_ref.add(parent_data)
                             parent_doc_id = parent_doc_ref[1].id
-                            print(f"[DEBUG] Created new student_violations document: {parent_doc_id}")
+                            logger.debug("Created new student_violations document: %s", parent_doc_id)
                         
                         # Add violation to violation_history subcollection
                         violation_history_data = {
@@ -1215,8 +1586,8 @@ def api_violations():
                             'description': data.get('description', ''),
                             'date': data.get('date', ''),
                             'status': data.get('status', 'Warning'),
-                            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                            'created_at': timestamp,
+                            'last_updated': timestamp
                         }
                         
                         # Add missing_items if description contains item information
@@ -1232,347 +1603,256 @@ def api_violations():
                                 violation_history_data['missing_items'] = missing_items
                                 violation_history_data['last_missing_items'] = missing_items
                         
-                        violation_history_ref = student_violations_ref.document(parent_doc_id).collection("violation_history")
-                        violation_history_doc = violation_history_ref.add(violation_history_data)
-                        violation_history_id = violation_history_doc[1].id
-                        print(f"[DEBUG] Added violation to violation_history: {violation_history_id} under parent {parent_doc_id}")
+                        # Link the mirror to its violations document so list pages show it once
+                        if doc_id:
+                            violation_history_data['violation_id'] = doc_id
+                        
+                        # Store the id as a field so collection group lookups can find it
+                        violation_history_ref = student_violations_ref.document(parent_doc_id).collection("violation_history").document()
+                        violation_history_data['id'] = violation_history_ref.id
+                        violation_history_ref.set(violation_history_data)
+                        violation_history_id = violation_history_ref.id
+                        logger.debug("Added violation to violation_history: %s under parent %s", violation_history_id, parent_doc_id)
                 except Exception as e:
-                    print(f"[WARN] Error adding violation to violation_history: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.warning("Error adding violation to violation_history: %s", e, exc_info=True)
             
             if doc_id:
-                print(f"[SUCCESS] Violation added successfully with ID: {doc_id}")
-                appeal_created = False
-                
-                # Automatically create an appeal for the violation if enabled
-                if AUTO_CREATE_APPEALS:
-                    try:
-                        appeal_data = {
-                            'student_name': data.get('student_name', ''),
-                            'student_id': data.get('student_id', ''),
-                            'violation_id': doc_id,
-                            'appeal_reason': 'Automatic appeal created for violation',
-                            'status': 'Pending Review',
-                            'submitted_date': data.get('date', ''),
-                            'submitted_by': data.get('student_name', 'Student'),
-                            'created_automatically': True
-                        }
-                        
-                        appeal_id = add_to_firebase("appeals", appeal_data)
-                        if appeal_id:
-                            print(f"[OK] Auto-created appeal {appeal_id} for violation {doc_id}")
-                            # Update the appeal data with the ID for consistency
-                            appeal_data['id'] = appeal_id
-                            update_in_firebase("appeals", appeal_id, appeal_data)
-                            appeal_created = True
-                        else:
-                            print(f"[WARN] Failed to auto-create appeal for violation {doc_id}")
-                    except Exception as e:
-                        print(f"[WARN] Error auto-creating appeal: {e}")
+                logger.info("Violation added successfully with ID: %s", doc_id)
                 
-                # Clear cache to force refresh
-                print(f"[CACHE] Clearing cache after adding violation {doc_id}")
-                clear_cache()
-                print(f"[CACHE] Cache cleared successfully")
+                # Clear the cache once for everything this request wrote, including an auto-created appeal
+                logger.debug("Clearing cache after adding violation %s", doc_id)
+                written = ["violations", "student_violations"]
+                if appeal_created:
+                    written.append("appeals")
+                invalidate_cache(*written)
+                logger.debug("Cache cleared successfully")
                 return {"success": True, "id": doc_id, "appeal_created": appeal_created}, 201
             else:
-                print(f"[ERROR] Failed to add violation to Firebase - add_to_firebase returned None")
+                logger.error("Failed to add violation to Firebase - add_to_firebase returned None")
                 return {"error": "Failed to add violation to database. Please check Firebase configuration.", "debug": "add_to_firebase_failed"}, 500
                 
         except Exception as e:
-            print(f"[ERROR] POST /api/violations failed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("POST /api/violations failed: %s", e)
             return {"error": f"Server error: {str(e)}", "debug": "exception_in_violation_creation"}, 500
 
 
 @app.route("/api/violations/<violation_id>", methods=["PUT"])
+@login_required
 def api_update_violation(violation_id):
     """API endpoint to update a violation"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
-    try:
-        data = request.get_json()
-        if not data:
-            return {"error": "No data provided"}, 400
-        
-        # Determine status based on violation count for this student
-        student_name = data.get('student_name', '')
-        student_id = data.get('student_id', '')
-        if student_name and student_id:
-            data['status'] = get_violation_status_by_count(student_name, student_id)
-        
-        # Update violation in Firebase
-        success = update_violation_in_firebase(violation_id, data)
-        if success:
-            # Clear cache to force refresh
-            clear_cache()
-            return {"success": True}, 200
-        else:
-            return {"error": "Failed to update violation"}, 500
-    except Exception as e:
-        return {"error": str(e)}, 500
+    data = request.get_json()
+    if not data:
+        return {"error": "No data provided"}, 400
+    
+    # Determine status based on violation count for this student
+    student_name = data.get('student_name', '')
+    student_id = data.get('student_id', '')
+    if student_name and student_id:
+        data['status'] = get_violation_status_by_count(student_name, student_id)
+    
+    # Update violation in Firebase
+    success = update_violation_in_firebase(violation_id, data)
+    if success:
+        # Clear cache to force refresh
+        invalidate_cache("violations", doc_id=violation_id)
+        return {"success": True}, 200
+    else:
+        return {"error": "Failed to update violation"}, 500
 
 @app.route("/api/violations/<violation_id>", methods=["DELETE"])
+@login_required
 def api_delete_violation(violation_id):
     """API endpoint to delete a violation"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
-    try:
-        # Delete violation from Firebase
-        success = delete_violation_from_firebase(violation_id)
-        if success:
-            # Clear cache to force refresh
-            clear_cache()
-            return {"success": True}, 200
-        else:
-            return {"error": "Failed to delete violation"}, 500
-    except Exception as e:
-        return {"error": str(e)}, 500
-
+    # Delete violation from Firebase
+    success = delete_violation_from_firebase(violation_id)
+    if success:
+        # Clear cache to force refresh
+        invalidate_cache("violations", "student_violations", doc_id=violation_id)
+        return {"success": True}, 200
+    else:
+        return {"error": "Failed to delete violation"}, 500
+
 
 @app.route("/api/violations/student/<student_id>", methods=["GET"])
+@login_required
 def api_get_student_violations(student_id):
     """API endpoint to get all violations for a specific student_id from violation_history"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
+    # Only the student's own parent documents are read; their violation_history is streamed in batches
+    parent_docs = query_firebase("student_violations", [("student_id", "==", student_id)])
+
+    student_violations = []
+    student_name_from_db = None
+    for parent in parent_docs:
+        parent_doc_id = parent['id']
+        parent_name = parent.get('name') or parent.get('student_name')
+        for vh in stream_from_firebase(f"student_violations/{parent_doc_id}/violation_history"):
+            # Get student name from students collection (once per request)
+            if student_name_from_db is None:
+                student_name_from_db = get_student_name_from_students_collection(student_id) or ''
+            student_name = student_name_from_db or parent_name or vh.get('student_name', vh.get('name', 'Unknown Student'))
+
+            violation_data = {
+                'id': vh.get('id', ''),
+                'parent_doc_id': parent_doc_id,
+                'student_id': student_id,
+                'student_name': student_name,
+                'violation_type': vh.get('violation_type', 'Uniform Violation'),
+                'status': vh.get('status', VIOLATION_STATUS_PENDING),
+                'date': vh.get('date', vh.get('created_at', '')),
+                'last_updated': vh.get('last_updated', ''),
+                'timestamp': vh.get('timestamp', vh.get('last_updated', vh.get('created_at', ''))),  # Include timestamp field
+                'created_at': vh.get('created_at', ''),
+                'missing_items': vh.get('missing_items', []),  # Include missing_items field
+                'last_missing_items': vh.get('last_missing_items', []),  # Also check last_missing_items
+                'description': vh.get('description', ''),
+                'source': 'violation_history'
+            }
+            student_violations.append(violation_data)
     
-    try:
-        # Get all violations from violation_history
-        violation_history = get_all_from_subcollection("student_violations", "violation_history") or []
-        
-        # Filter violations for this student_id
-        student_violations = []
-        for vh in violation_history:
-            if vh.get('student_id') == student_id:
-                # Get student name from students collection
-                student_name = get_student_name_from_students_collection(student_id)
-                if not student_name:
-                    student_name = vh.get('student_name', vh.get('name', 'Unknown Student'))
-                
-                violation_data = {
-                    'id': vh.get('id', ''),
-                    'parent_doc_id': vh.get('parent_doc_id', ''),
-                    'student_id': student_id,
-                    'student_name': student_name,
-                    'violation_type': vh.get('violation_type', 'Uniform Violation'),
-                    'status': vh.get('status', 'Pending'),
-                    'date': vh.get('date', vh.get('created_at', '')),
-                    'last_updated': vh.get('last_updated', ''),
-                    'timestamp': vh.get('timestamp', vh.get('last_updated', vh.get('created_at', ''))),  # Include timestamp field
-                    'created_at': vh.get('created_at', ''),
-                    'missing_items': vh.get('missing_items', []),  # Include missing_items field
-                    'last_missing_items': vh.get('last_missing_items', []),  # Also check last_missing_items
-                    'description': vh.get('description', ''),
-                    'source': 'violation_history'
-                }
-                student_violations.append(violation_data)
-        
-        print(f"[API] GET /api/violations/student/{student_id} returning {len(student_violations)} violations")
-        return {"success": True, "data": student_violations}, 200
-    except Exception as e:
-        print(f"[ERROR] GET /api/violations/student/{student_id} failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"error": str(e)}, 500
+    logger.debug("GET /api/violations/student/%s returning %s violations", student_id, len(student_violations))
+    return {"success": True, "data": student_violations}, 200
 
 
 @app.route("/api/uniform-violations-management", methods=["GET"])
+@login_required
 def api_uniform_violations_management():
     """API endpoint to get uniform violations management data grouped by student"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
-    try:
-        # Get violations grouped by student
-        management_data = get_uniform_violations_management_data()
-        print(f"[API] GET /api/uniform-violations-management returning {len(management_data)} students")
-        return {"success": True, "data": management_data}, 200
-    except Exception as e:
-        print(f"[ERROR] GET /api/uniform-violations-management failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"error": str(e)}, 500
+    # Get violations grouped by student
+    management_data = get_uniform_violations_management_data()
+    logger.debug("GET /api/uniform-violations-management returning %s students", len(management_data))
+    return {"success": True, "data": management_data}, 200
 
 
 @app.route("/api/violations/student/<student_name>", methods=["DELETE"])
+@login_required
 def api_delete_student_violations(student_name):
     """API endpoint to delete all violations for a specific student from both collections and violation_history subcollection"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
+    # Decode and normalize student name
+    student_name = unquote(student_name).strip()
+    
+    # Query only this student's documents from every collection and subcollection; student_violations
+    # and violation_history (where the management table data comes from) store the name under either field
+    violations_future = _io_pool.submit(query_firebase, "violations", [("student_name", "==", student_name)], None)
+    student_collection_futures = [
+        _io_pool.submit(query_firebase, "student_violations", [(field, "==", student_name)], None)
+        for field in ("name", "student_name")
+    ]
+    history_futures = [
+        _io_pool.submit(query_firebase_group, "violation_history", [(field, "==", student_name)], None)
+        for field in ("student_name", "name")
+    ]
+    violations_from_collection = violations_future.result()
+    # A document carrying the name in both fields comes back from both queries; keep it once
+    violations_from_student_collection = list({
+        v['id']: v for future in student_collection_futures for v in future.result()
+    }.values())
+    violations_from_history = list({
+        (v['parent_doc_id'], v['id']): v for future in history_futures for v in future.result()
+    }.values())
+    
+    # Combine all violation IDs to delete
+    all_violation_ids = set()
+    for v in violations_from_collection:
+        if v.get('id'):
+            all_violation_ids.add(v.get('id'))
+    for v in violations_from_student_collection:
+        if v.get('id'):
+            all_violation_ids.add(v.get('id'))
+    for v in violations_from_history:
+        if v.get('id'):
+            all_violation_ids.add(v.get('id'))
+    
+    if not all_violation_ids:
+        return {"success": True, "deleted_count": 0, "message": "No violations found for this student"}, 200
+    
+    # Get student_id from the first violation for cleanup (check all sources)
+    student_id = None
+    if violations_from_collection:
+        student_id = violations_from_collection[0].get('student_id')
+    elif violations_from_student_collection:
+        student_id = violations_from_student_collection[0].get('student_id')
+    elif violations_from_history:
+        student_id = violations_from_history[0].get('student_id')
+    
+    # Delete every violation in batch commits; the locations are already known
+    # from the fetches above, so no per-violation lookup is needed
+    delete_refs = [("violations", v['id']) for v in violations_from_collection if v.get('id')]
+    delete_refs.extend(
+        (f"student_violations/{v['parent_doc_id']}/violation_history", v['id'])
+        for v in violations_from_history if v.get('id') and v.get('parent_doc_id')
+    )
+    deleted_violations, failed_violations = delete_many_from_firebase(delete_refs)
     
-    try:
-        # Decode and normalize student name
-        from urllib.parse import unquote
-        student_name = unquote(student_name).strip()
-        
-        # Get all violations from all collections and subcollections
-        violations = get_from_firebase("violations") or []
-        student_violations_list = get_from_firebase("student_violations") or []
-        violation_history = get_all_from_subcollection("student_violations", "violation_history") or []
-        
-        # Filter violations for this student from all sources (case-insensitive matching)
-        violations_from_collection = [v for v in violations if (v.get('student_name') or '').strip() == student_name]
-        violations_from_student_collection = [v for v in student_violations_list if (v.get('name') or '').strip() == student_name or (v.get('student_name') or '').strip() == student_name]
-        # Filter from violation_history subcollection (this is where management table data comes from)
-        violations_from_history = [v for v in violation_history if (v.get('student_name') or '').strip() == student_name or (v.get('name') or '').strip() == student_name]
-        
-        # Combine all violation IDs to delete
-        all_violation_ids = set()
-        for v in violations_from_collection:
-            if v.get('id'):
-                all_violation_ids.add(v.get('id'))
-        for v in violations_from_student_collection:
-            if v.get('id'):
-                all_violation_ids.add(v.get('id'))
-        for v in violations_from_history:
-            if v.get('id'):
-                all_violation_ids.add(v.get('id'))
-        
-        if not all_violation_ids:
-            return {"success": True, "deleted_count": 0, "message": "No violations found for this student"}, 200
-        
-        # Get student_id from the first violation for cleanup (check all sources)
-        student_id = None
-        if violations_from_collection:
-            student_id = violations_from_collection[0].get('student_id')
-        elif violations_from_student_collection:
-            student_id = violations_from_student_collection[0].get('student_id')
-        elif violations_from_history:
-            student_id = violations_from_history[0].get('student_id')
-        
-        # Delete each violation (this will check both collections automatically)
-        deleted_violations = 0
-        failed_violations = 0
-        
-        for violation_id in all_violation_ids:
-            success = delete_violation_from_firebase(violation_id)
-            if success:
-                deleted_violations += 1
-            else:
-                failed_violations += 1
-        
-        # Clean up student document if all violations are deleted
-        if student_id and deleted_violations > 0:
-            cleanup_student_document_if_no_violations(student_name, student_id)
-        
-        # Clear cache to force refresh
-        clear_cache()
-        
-        # Prepare response message
-        total_deleted = deleted_violations
-        total_failed = failed_violations
-        
-        if total_failed == 0:
-            message = f"Successfully deleted {deleted_violations} violation(s) for {student_name}"
-        else:
-            message = f"Deleted {deleted_violations} violation(s) for {student_name}, {total_failed} failed"
-        
-        return {
-            "success": True, 
-            "deleted_violations": deleted_violations,
-            "total_deleted": total_deleted,
-            "message": message
-        }, 200
-            
-    except Exception as e:
-        return {"error": str(e)}, 500
+    # Clean up student document if all violations are deleted (this also
+    # removes matching student_violations parent documents)
+    if student_id and failed_violations == 0:
+        cleanup_student_document_if_no_violations(student_name, student_id)
+    
+    # Clear cache to force refresh
+    invalidate_cache("violations", "student_violations")
+    
+    # Prepare response message
+    total_deleted = deleted_violations
+    total_failed = failed_violations
+    
+    if total_failed == 0:
+        message = f"Successfully deleted {deleted_violations} violation(s) for {student_name}"
+    else:
+        message = f"Deleted {deleted_violations} violation(s) for {student_name}, {total_failed} failed"
+    
+    return {
+        "success": True, 
+        "deleted_violations": deleted_violations,
+        "total_deleted": total_deleted,
+        "message": message
+    }, 200
 
 @app.route("/api/appeals", methods=["GET", "POST"])
+@login_required
 def api_appeals():
     """API endpoint to get all appeals or add a new appeal"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
     if request.method == "GET":
-        try:
-            # Get all appeals from student_appeals collection (primary source)
-            student_appeals_list = get_student_appeals_from_firebase()
-            
-            # Get appeals from legacy appeals collection (for backward compatibility)
-            legacy_appeals = get_from_firebase("appeals") or []
-            
-            # Get student violations formatted as appeals from student_violations collection
-            student_violations_appeals = get_student_violations_as_appeals()
-            
-            # Merge all collections (student_appeals takes priority)
-            all_appeals = student_appeals_list + legacy_appeals + student_violations_appeals
-            
-            print(f"[API] GET /api/appeals returning {len(all_appeals)} appeals (from student_appeals: {len(student_appeals_list)}, from appeals: {len(legacy_appeals)}, from violation_history: {len(student_violations_appeals)})")
-            
-            # Debug: Print first few appeals to see their structure
-            if all_appeals:
-                print(f"[DEBUG] First appeal structure: {all_appeals[0]}")
-                print(f"[DEBUG] Appeal IDs: {[a.get('id', 'NO_ID') for a in all_appeals[:5]]}")
-            
-            # Migrate existing appeals to include reason_type if missing
-            appeals_to_update = []
-            
-            for appeal in legacy_appeals:  # Only update appeals from the legacy appeals collection
-                if 'reason_type' not in appeal or not appeal['reason_type']:
-                    appeal['reason_type'] = 'Unexcused'
-                    if 'id' in appeal:
-                        appeals_to_update.append(appeal)
-            
-            # Update only appeals that need migration
-            if appeals_to_update:
-                print(f"[MIGRATION] Updating {len(appeals_to_update)} appeals with default reason_type")
-                for appeal in appeals_to_update:
-                    try:
-                        update_in_firebase("appeals", appeal['id'], appeal)
-                    except Exception as e:
-                        print(f"[WARN] Failed to update appeal {appeal['id']}: {e}")
-                clear_cache()
-            
-            return {"success": True, "data": all_appeals}, 200
-        except Exception as e:
-            print(f"[ERROR] GET /api/appeals failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return {"error": str(e)}, 500
+        # Serve the merged list from cache; the entry stores its own expiry time
+        current_time = time.time()
+        with _cache_lock:
+            cached = _cache.get(APPEALS_CACHE_KEY)
+        if cached and current_time < cached[1]:
+            logger.debug("Using cached data for appeals")
+            return etag_response({"success": True, "data": cached[0]}, cached[2])
+        
+        # The three sources are independent, so fetch them concurrently:
+        # student_appeals (primary source), the legacy appeals collection
+        # (backward compatibility) and student violations formatted as appeals
+        student_appeals_future = _io_pool.submit(get_student_appeals_from_firebase)
+        legacy_appeals_future = _io_pool.submit(get_from_firebase, "appeals")
+        student_violations_appeals_future = _io_pool.submit(get_student_violations_as_appeals)
+        student_appeals_list = student_appeals_future.result()
+        legacy_appeals = legacy_appeals_future.result() or []
+        student_violations_appeals = student_violations_appeals_future.result()
+        # Legacy appeals the startup backfill has not reached yet get the default in memory only
+        for appeal in legacy_appeals:
+            if not appeal.get('reason_type'):
+                appeal['reason_type'] = 'Unexcused'
+        
+        # Merge all collections, keeping one appeal per document id (student_appeals takes priority)
+        all_appeals = merge_unique(student_appeals_list, legacy_appeals, student_violations_appeals)
+        
+        logger.debug("GET /api/appeals returning %s appeals (from student_appeals: %s, from appeals: %s, from violation_history: %s)", len(all_appeals), len(student_appeals_list), len(legacy_appeals), len(student_violations_appeals))
+        
+        # Debug: Print first few appeals to see their structure
+        if all_appeals and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("First appeal structure: %s", all_appeals[0])
+            logger.debug("Appeal IDs: %s", [a.get('id', 'NO_ID') for a in all_appeals[:5]])
+        
+        expires_at = current_time + CACHE_DURATION
+        etag = content_etag(all_appeals)
+        with _cache_lock:
+            _cache[APPEALS_CACHE_KEY] = (all_appeals, expires_at, etag)
+            prune_cache(current_time)
+        
+        return etag_response({"success": True, "data": all_appeals}, etag)
     
     elif request.method == "POST":
-        try:
-            data = request.get_json()
-            if not data:
-                return {"error": "No data provided"}, 400
-            
-            # Set default reason_type if not provided
-            if 'reason_type' not in data or not data['reason_type']:
-                data['reason_type'] = 'Unexcused'
-            
-            # Add appeal to student_appeals collection (primary collection)
-            doc_id = add_student_appeal_to_firebase(data)
-            if doc_id:
-                # Clear cache to force refresh
-                clear_cache()
-                return {"success": True, "id": doc_id}, 201
-            else:
-                # Fallback to legacy appeals collection if student_appeals fails
-                print("[WARN] Failed to add to student_appeals, trying legacy appeals collection")
-                doc_id = add_to_firebase("appeals", data)
-                if doc_id:
-                    clear_cache()
-                    return {"success": True, "id": doc_id}, 201
-                else:
-                    return {"error": "Failed to add appeal"}, 500
-        except Exception as e:
-            print(f"[ERROR] POST /api/appeals failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return {"error": str(e)}, 500
-
-
-@app.route("/api/appeals/<appeal_id>", methods=["PUT"])
-def api_update_appeal(appeal_id):
-    """API endpoint to update an appeal"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
-    try:
         data = request.get_json()
         if not data:
             return {"error": "No data provided"}, 400
@@ -1581,578 +1861,456 @@ def api_update_appeal(appeal_id):
         if 'reason_type' not in data or not data['reason_type']:
             data['reason_type'] = 'Unexcused'
         
-        # Determine which collection contains this appeal
-        appeal = None
-        collection_name = None
-        
-        # First, try to get document directly by document ID (in case appeal_id is the Firebase document ID)
-        if firebase_manager.db:
-            try:
-                # Try student_appeals collection first
-                doc_ref = firebase_manager.db.collection("student_appeals").document(appeal_id)
-                doc = doc_ref.get()
-                if doc.exists:
-                    appeal = doc.to_dict()
-                    appeal['id'] = doc.id
-                    collection_name = "student_appeals"
-                    print(f"[INFO] Appeal {appeal_id} found in student_appeals collection (by document ID)")
-                else:
-                    # Try legacy appeals collection
-                    doc_ref = firebase_manager.db.collection("appeals").document(appeal_id)
-                    doc = doc_ref.get()
-                    if doc.exists:
-                        appeal = doc.to_dict()
-                        appeal['id'] = doc.id
-                        collection_name = "appeals"
-                        print(f"[INFO] Appeal {appeal_id} found in appeals collection (by document ID)")
-            except Exception as e:
-                print(f"[DEBUG] Error getting document by ID: {e}")
-        
-        # If not found by document ID, search by 'id' field in collections
-        if not appeal:
-            # First check in student_appeals collection (primary collection)
-            student_appeals = get_from_firebase("student_appeals") or []
-            appeal = next((a for a in student_appeals if a.get('id') == appeal_id), None)
-            if appeal:
-                collection_name = "student_appeals"
-                print(f"[INFO] Appeal {appeal_id} found in student_appeals collection (by id field)")
+        # Add appeal to student_appeals collection (primary collection)
+        doc_id = add_student_appeal_to_firebase(data)
+        if doc_id:
+            # Clear cache to force refresh
+            invalidate_cache("student_appeals")
+            return {"success": True, "id": doc_id}, 201
+        else:
+            # Fallback to legacy appeals collection if student_appeals fails
+            logger.warning("Failed to add to student_appeals, trying legacy appeals collection")
+            doc_id = add_to_firebase("appeals", data)
+            if doc_id:
+                invalidate_cache("appeals")
+                return {"success": True, "id": doc_id}, 201
             else:
-                # Check in legacy appeals collection
-                appeals = get_from_firebase("appeals") or []
-                appeal = next((a for a in appeals if a.get('id') == appeal_id), None)
-                if appeal:
-                    collection_name = "appeals"
-                    print(f"[INFO] Appeal {appeal_id} found in appeals collection (by id field)")
-                else:
-                    # Check in student_violations collection
-                    student_violations = get_from_firebase("student_violations") or []
-                    appeal = next((sv for sv in student_violations if sv.get('id') == appeal_id), None)
-                    if appeal:
-                        collection_name = "student_violations"
-                        print(f"[INFO] Appeal {appeal_id} found in student_violations collection (by id field)")
-                    else:
-                        # Check in violation_history subcollection (appeals might be stored there)
-                        try:
-                            violation_history = get_all_from_subcollection("student_violations", "violation_history") or []
-                            appeal = next((vh for vh in violation_history if vh.get('id') == appeal_id), None)
-                            if appeal:
-                                # This is a violation that can be treated as an appeal
-                                collection_name = "student_violations"  # Parent collection
-                                parent_doc_id = appeal.get('parent_doc_id')
-                                print(f"[INFO] Appeal {appeal_id} found in violation_history subcollection (parent: {parent_doc_id})")
-                                # Note: We'll need to update via the parent document and subcollection
-                        except Exception as e:
-                            print(f"[DEBUG] Error checking violation_history: {e}")
-        
-        if not appeal:
-            print(f"[ERROR] Appeal {appeal_id} not found in any collection")
-            print(f"[DEBUG] Searched in: student_appeals, appeals, student_violations")
-            # Try to get a sample of IDs from each collection for debugging
-            try:
-                sample_student_appeals = get_from_firebase("student_appeals", limit=5) or []
-                sample_appeals = get_from_firebase("appeals", limit=5) or []
-                print(f"[DEBUG] Sample student_appeals IDs: {[a.get('id') for a in sample_student_appeals]}")
-                print(f"[DEBUG] Sample appeals IDs: {[a.get('id') for a in sample_appeals]}")
-            except Exception as e:
-                print(f"[DEBUG] Error getting sample IDs: {e}")
-            return {"error": f"Appeal {appeal_id} not found"}, 404
-        
-        # Check if appeal is being approved
-        violation_deleted = False
-        from datetime import datetime
-        
-        # Handle approved_date based on status changes
-        current_status = appeal.get('status', 'Pending Review')
-        new_status = data.get('status')
-        
-        if new_status == 'Approved':
-            # Only set approved_date if it's not already set (to preserve original approval date)
-            if 'approved_date' not in data or not data.get('approved_date'):
-                data['approved_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                print(f"[INFO] Setting approved_date for appeal {appeal_id}: {data['approved_date']}")
-        elif current_status == 'Approved' and new_status != 'Approved':
-            # Clear approved_date if status changes from Approved to something else
-            data['approved_date'] = ''
-            print(f"[INFO] Clearing approved_date for appeal {appeal_id} (status changed from Approved to {new_status})")
-        
-        if data.get('status') == 'Approved' and AUTO_DELETE_VIOLATIONS_ON_APPEAL_APPROVAL:
-            print(f"[REFRESH] Appeal {appeal_id} is being approved - checking for related violation to delete...")
+                return {"error": "Failed to add appeal"}, 500
+
+
+@app.route("/api/appeals/<appeal_id>", methods=["PUT"])
+@login_required
+def api_update_appeal(appeal_id):
+    """API endpoint to update an appeal"""
+    data = request.get_json()
+    if not data:
+        return {"error": "No data provided"}, 400
+    
+    # Set default reason_type if not provided
+    if 'reason_type' not in data or not data['reason_type']:
+        data['reason_type'] = 'Unexcused'
+    
+    # Determine which collection contains this appeal
+    appeal = None
+    collection_name = None
+    
+    # First, try to get document directly by document ID (in case appeal_id is the Firebase document ID)
+    for candidate in ("student_appeals", "appeals", "student_violations"):
+        appeal = get_one_from_firebase(candidate, appeal_id)
+        if appeal:
+            collection_name = candidate
+            logger.info("Appeal %s found in %s collection (by document ID)", appeal_id, candidate)
+            break
+    
+    # If not found by document ID, query the 'id' field in each collection
+    if not appeal:
+        for candidate in ("student_appeals", "appeals", "student_violations"):
+            matches = query_firebase(candidate, [("id", "==", appeal_id)], limit=1)
+            if matches:
+                appeal = matches[0]
+                collection_name = candidate
+                logger.info("Appeal %s found in %s collection (by id field)", appeal_id, candidate)
+                break
+    
+    # Check in violation_history subcollection (appeals might be stored there)
+    if not appeal:
+        try:
+            matches = query_firebase_group("violation_history", [("id", "==", appeal_id)], limit=1)
+            if matches:
+                appeal = matches[0]
+                # This is a violation that can be treated as an appeal
+                collection_name = "student_violations"  # Parent collection
+                logger.info("Appeal %s found in violation_history subcollection (parent: %s)", appeal_id, appeal.get('parent_doc_id'))
+        except Exception as e:
+            logger.debug("Error checking violation_history: %s", e)
+    
+    if not appeal:
+        logger.error("Appeal %s not found in any collection", appeal_id)
+        logger.debug("Searched in: student_appeals, appeals, student_violations, violation_history")
+        return {"error": f"Appeal {appeal_id} not found"}, 404
+    
+    # Check if appeal is being approved
+    violation_deleted = False
+    violation_refs = []  # related violation documents deleted in the same batch as the appeal update
+    
+    # Handle approved_date based on status changes
+    current_status = appeal.get('status', APPEAL_STATUS_PENDING)
+    new_status = data.get('status')
+    is_approval = new_status == 'Approved'
+    
+    if is_approval:
+        # Only set approved_date if it's not already set (to preserve original approval date)
+        if not data.get('approved_date'):
+            data['approved_date'] = current_timestamp()
+            logger.info("Setting approved_date for appeal %s: %s", appeal_id, data['approved_date'])
+        
+        if AUTO_DELETE_VIOLATIONS_ON_APPEAL_APPROVAL:
+            logger.debug("Appeal %s is being approved - checking for related violation to delete...", appeal_id)
             try:
-                # Get violation_id from the appeal
-                violation_id = appeal.get('violation_id') or appeal.get('id')  # For student_violations, the id is the violation_id
+                # Only an explicit violation_id links to a violation; the appeal's own id is never
+                # deleted here, since that document (and its violation_history) is the one being updated
+                violation_id = appeal.get('violation_id')
                 
                 if violation_id:
-                    print(f"[SEARCH] Found related violation {violation_id} for appeal {appeal_id}")
-                    
-                    # Delete the related violation from violations collection
-                    violation_deleted = delete_from_firebase("violations", violation_id)
-                    if violation_deleted:
-                        print(f"[OK] Successfully deleted violation {violation_id} for approved appeal {appeal_id}")
-                    else:
-                        # Also try deleting from student_violations if it's a student_violations appeal
-                        if collection_name == "student_violations":
-                            violation_deleted = delete_from_firebase("student_violations", violation_id)
-                            if violation_deleted:
-                                print(f"[OK] Successfully deleted student_violation {violation_id} for approved appeal {appeal_id}")
-                            else:
-                                print(f"[WARN] Failed to delete violation {violation_id} for approved appeal {appeal_id}")
-                        else:
-                            print(f"[WARN] Failed to delete violation {violation_id} for approved appeal {appeal_id}")
+                    logger.debug("Found related violation %s for appeal %s", violation_id, appeal_id)
+                    violation_refs.append(("violations", violation_id))
                 else:
-                    print(f"[WARN] No violation_id found for appeal {appeal_id} - skipping violation deletion")
+                    logger.warning("No violation_id found for appeal %s - skipping violation deletion", appeal_id)
             except Exception as e:
-                print(f"[WARN] Error finding/deleting related violation: {e}")
-        elif data.get('status') == 'Approved' and not AUTO_DELETE_VIOLATIONS_ON_APPEAL_APPROVAL:
-            print(f"[INFO] Appeal {appeal_id} approved but auto-deletion is disabled")
-        
-        # Check if appeal is in violation_history subcollection
-        parent_doc_id = appeal.get('parent_doc_id')
-        is_subcollection = parent_doc_id is not None
-        
-        # Map status field for student_violations
-        if collection_name == "student_violations":
-            # For student_violations, use appeal_status field
-            if 'status' in data:
-                data['appeal_status'] = data['status']
-                # Also keep status for compatibility
-            print(f"[INFO] Updating student_violation {appeal_id} with status: {data.get('status')}")
-        
-        # Update appeal in the correct collection
+                logger.warning("Error finding/deleting related violation: %s", e)
+        else:
+            logger.info("Appeal %s approved but auto-deletion is disabled", appeal_id)
+    elif current_status == 'Approved':
+        # Clear approved_date if status changes from Approved to something else
+        data['approved_date'] = ''
+        logger.info("Clearing approved_date for appeal %s (status changed from Approved to %s)", appeal_id, new_status)
+    
+    # Check if appeal is in violation_history subcollection
+    parent_doc_id = appeal.get('parent_doc_id')
+    is_subcollection = parent_doc_id is not None
+    
+    # Map status field for student_violations
+    if collection_name == "student_violations":
+        # For student_violations, use appeal_status field
+        if 'status' in data:
+            data['appeal_status'] = data['status']
+            # Also keep status for compatibility
+        logger.info("Updating student_violation %s with status: %s", appeal_id, data.get('status'))
+    
+    # Update appeal in the correct collection
+    if violation_refs:
+        # Approval and violation deletion land together or not at all
         if is_subcollection and parent_doc_id:
-            # Update in violation_history subcollection
-            try:
-                if firebase_manager.db:
-                    # Update the subcollection document
-                    doc_ref = firebase_manager.db.collection("student_violations").document(parent_doc_id).collection("violation_history").document(appeal_id)
-                    data['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    doc_ref.update(data)
-                    print(f"[OK] Appeal {appeal_id} updated in violation_history subcollection (parent: {parent_doc_id})")
-                    success = True
-                else:
-                    success = False
-            except Exception as e:
-                print(f"[ERROR] Error updating subcollection document: {e}")
-                success = False
+            appeal_path = f"student_violations/{parent_doc_id}/violation_history"
+            data['updated_at'] = current_timestamp()
         else:
-            # Update in regular collection
-            success = update_in_firebase(collection_name, appeal_id, data)
+            appeal_path = collection_name
+            data['updated_at'] = datetime.now()
+        success = update_and_delete_in_firebase(appeal_path, appeal_id, data, violation_refs)
+        violation_deleted = success
         if success:
-            # Clear cache to force refresh
-            clear_cache()
-            return {"success": True, "violation_deleted": violation_deleted}, 200
-        else:
-            print(f"[ERROR] Failed to update appeal {appeal_id} in {collection_name} collection")
-            return {"error": f"Failed to update appeal in {collection_name}"}, 500
-    except Exception as e:
-        print(f"[ERROR] Exception in api_update_appeal: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"error": str(e)}, 500
+            logger.info("Deleted violation %s for approved appeal %s", violation_refs[0][1], appeal_id)
+    elif is_subcollection and parent_doc_id:
+        # Update in violation_history subcollection
+        try:
+            if firebase_manager.db:
+                # Update the subcollection document
+                doc_ref = firebase_manager.db.collection("student_violations").document(parent_doc_id).collection("violation_history").document(appeal_id)
+                data['updated_at'] = current_timestamp()
+                doc_ref.update(data)
+                logger.info("Appeal %s updated in violation_history subcollection (parent: %s)", appeal_id, parent_doc_id)
+                success = True
+            else:
+                success = False
+        except Exception as e:
+            logger.error("Error updating subcollection document: %s", e)
+            success = False
+    else:
+        # Update in regular collection
+        success = update_in_firebase(collection_name, appeal_id, data)
+    if success:
+        # Clear cache to force refresh
+        invalidate_cache(collection_name, "violations")
+        return {"success": True, "violation_deleted": violation_deleted}, 200
+    else:
+        logger.error("Failed to update appeal %s in %s collection", appeal_id, collection_name)
+        return {"error": f"Failed to update appeal in {collection_name}"}, 500
 
 @app.route("/api/appeals/<appeal_id>", methods=["DELETE"])
+@login_required
 def api_delete_appeal(appeal_id):
     """API endpoint to delete an appeal"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
-    try:
-        # Delete appeal from Firebase
-        success = delete_appeal_from_firebase(appeal_id)
-        if success:
-            # Clear cache to force refresh
-            clear_cache()
-            return {"success": True}, 200
-        else:
-            return {"error": "Failed to delete appeal"}, 500
-    except Exception as e:
-        return {"error": str(e)}, 500
+    # Delete appeal from Firebase
+    success = delete_appeal_from_firebase(appeal_id)
+    if success:
+        # Clear cache to force refresh
+        invalidate_cache("student_appeals", "appeals", doc_id=appeal_id)
+        return {"success": True}, 200
+    else:
+        return {"error": "Failed to delete appeal"}, 500
 
 @app.route("/api/designs", methods=["GET", "POST"])
+@login_required
 def api_designs():
     """API endpoint to get all designs or add a new design"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
     if request.method == "GET":
-        try:
-            # Get all designs from Firebase
-            designs = get_from_firebase("uniform_designs") or []
-            return {"success": True, "data": designs}, 200
-        except Exception as e:
-            return {"error": str(e)}, 500
+        # Get all designs from Firebase
+        designs = get_from_firebase("uniform_designs") or []
+        return etag_response({"success": True, "data": designs}, content_etag(designs))
     
     elif request.method == "POST":
-        try:
-            # Handle file upload
-            name = request.form.get("name", "").strip()
-            typ = request.form.get("type", "").strip()
-            
-            if not name or not typ:
-                return {"error": "Design name and type are required"}, 400
-            
-            # Handle multiple image uploads
-            image_urls = []
-            image_titles = []
-            
-            # Get all images (can be multiple with same name "image")
-            files = request.files.getlist("image")
-            titles = request.form.getlist("image_title")
-            
-            for idx, file in enumerate(files):
-                if file and file.filename:
-                    try:
-                        suffix = os.path.splitext(file.filename)[1]
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                            file.save(tmp.name)
-                            tmp_path = tmp.name
-                        
-                        # Upload to Cloudinary
-                        public_id = f"design_{name.replace(' ', '_')}_{int(time.time())}_{idx}"
-                        image_url = upload_image_to_cloudinary(tmp_path, public_id)
-                        
-                        if image_url:
-                            image_urls.append(image_url)
-                            # Get corresponding title or use default
-                            title = titles[idx] if idx < len(titles) and titles[idx] else f"Image {idx + 1}"
-                            image_titles.append(title)
-                        else:
-                            print(f"[WARN] Image {idx + 1} upload failed")
-                        
-                        # Clean up temporary file
-                        try:
-                            os.unlink(tmp_path)
-                        except Exception:
-                            pass
-                    except Exception as e:
-                        print(f"Error uploading image {idx + 1}: {e}")
-            
-            # For backward compatibility, also set image_url to first image if available
-            image_url = image_urls[0] if image_urls else ""
-            
-            status = request.form.get("status", "Under Review")
-            approved_date = None
-            if status == "Approved":
-                from datetime import datetime
-                approved_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            data = {
-                "name": name,
-                "type": typ,
-                "image_url": image_url,  # Keep for backward compatibility
-                "image_urls": image_urls,  # Array of all image URLs
-                "image_titles": image_titles,  # Array of image titles
-                "created_date": time.strftime('%Y-%m-%d'),
-                "status": status,
-                "approved_date": approved_date
-            }
-            
-            print(f"[DEBUG] Saving design with {len(image_urls)} images")
-            print(f"[DEBUG] Image URLs: {image_urls}")
-            print(f"[DEBUG] Image Titles: {image_titles}")
-            
-            # Add design to Firebase
-            doc_id = add_to_firebase("uniform_designs", data)
-            if doc_id:
-                # Clear cache to force refresh
-                clear_cache()
-                return {"success": True, "id": doc_id}, 201
-            else:
-                return {"error": "Failed to add design"}, 500
-        except Exception as e:
-            return {"error": str(e)}, 500
+        # Handle file upload
+        name = request.form.get("name", "").strip()
+        typ = request.form.get("type", "").strip()
+        
+        if not name or not typ:
+            return {"error": "Design name and type are required"}, 400
+        
+        # Handle multiple image uploads
+        image_urls = []
+        image_titles = []
+        
+        # Get all images (can be multiple with same name "image")
+        files = request.files.getlist("image")
+        titles = request.form.getlist("image_title")
+        
+        # Stream each upload straight to Cloudinary without a temp file; the uploads are
+        # independent, so run them concurrently and wait for the slowest rather than the sum
+        public_id_prefix = f"design_{slugify(name)}_{uuid.uuid4().hex[:8]}"
+        uploads = [
+            (idx, _upload_pool.submit(upload_image_to_cloudinary, file.stream, f"{public_id_prefix}_{idx}"))
+            for idx, file in enumerate(files)
+            if file and file.filename
+        ]
+        for idx, upload in uploads:
+            try:
+                image_url = upload.result()
+                
+                if image_url:
+                    image_urls.append(image_url)
+                    # Get corresponding title or use default
+                    title = titles[idx] if idx < len(titles) and titles[idx] else f"Image {idx + 1}"
+                    image_titles.append(title)
+                else:
+                    logger.warning("Image %s upload failed", idx + 1)
+            except Exception as e:
+                logger.warning("Error uploading image %s: %s", idx + 1, e)
+        
+        # For backward compatibility, also set image_url to first image if available
+        image_url = image_urls[0] if image_urls else ""
+        
+        status = request.form.get("status", DESIGN_STATUS_UNDER_REVIEW)
+        approved_date = None
+        if status == "Approved":
+            approved_date = current_timestamp()
+        
+        data = {
+            "name": name,
+            "type": typ,
+            "image_url": image_url,  # Keep for backward compatibility
+            "image_urls": image_urls,  # Array of all image URLs
+            "image_titles": image_titles,  # Array of image titles
+            "created_date": current_date(),
+            "status": status,
+            "approved_date": approved_date
+        }
+        
+        logger.debug("Saving design with %s images", len(image_urls))
+        logger.debug("Image URLs: %s", image_urls)
+        logger.debug("Image Titles: %s", image_titles)
+        
+        # Add design to Firebase
+        doc_id = add_to_firebase("uniform_designs", data)
+        if doc_id:
+            # Clear cache to force refresh
+            invalidate_cache("uniform_designs")
+            return {"success": True, "id": doc_id}, 201
+        else:
+            return {"error": "Failed to add design"}, 500
 
 
 @app.route("/api/designs/<design_id>", methods=["GET"])
+@login_required
 def api_get_design(design_id):
     """API endpoint to get a single design by ID"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
+    logger.debug("api_get_design called with design_id: %s", design_id)
     
-    print(f"[DEBUG] api_get_design called with design_id: {design_id}")
+    # The design ID is normally the document ID, so a direct get is the cheapest lookup
+    design = get_one_from_firebase("uniform_designs", design_id)
+    if design:
+        logger.debug("Found design by document ID")
+        return {"success": True, "data": design}, 200
     
-    try:
-        # First, try to search by 'id' field
-        print(f"[DEBUG] Searching by 'id' field for: {design_id}")
-        design = search_in_firebase("uniform_designs", "id", design_id)
-        if design:
-            print(f"[DEBUG] Found design by 'id' field")
-            return {"success": True, "data": design[0]}, 200
-        
-        # If not found by 'id' field, try to get document directly by document ID
-        if firebase_manager.db:
-            try:
-                print(f"[DEBUG] Trying to get document directly by document ID: {design_id}")
-                doc_ref = firebase_manager.db.collection("uniform_designs").document(design_id)
-                doc = doc_ref.get()
-                if doc.exists:
-                    doc_data = doc.to_dict()
-                    doc_data['id'] = doc.id
-                    print(f"[DEBUG] Found design by document ID")
-                    return {"success": True, "data": doc_data}, 200
-                else:
-                    print(f"[DEBUG] Document with ID {design_id} does not exist")
-            except Exception as e:
-                print(f"[DEBUG] Error getting document by ID: {e}")
-        
-        # If still not found, try searching all designs and match by ID
-        print(f"[DEBUG] Searching all designs for matching ID")
-        all_designs = get_from_firebase("uniform_designs") or []
-        print(f"[DEBUG] Retrieved {len(all_designs)} designs from Firebase")
-        for i, d in enumerate(all_designs):
-            # Check if the design_id matches the document ID or the 'id' field
-            if isinstance(d, dict):
-                d_id = d.get('id')
-                print(f"[DEBUG] Design {i}: id field = {d_id}, looking for {design_id}")
-                if d_id == design_id:
-                    print(f"[DEBUG] Found design by matching 'id' field in all designs")
-                    return {"success": True, "data": d}, 200
-            # Also check if design_id might be in the document reference
-            if hasattr(d, 'id') and str(d.id) == design_id:
-                print(f"[DEBUG] Found design by matching document attribute")
-                return {"success": True, "data": d}, 200
-        
-        print(f"[DEBUG] Design not found after all search methods")
-        return {"error": "Design not found"}, 404
-    except Exception as e:
-        print(f"[ERROR] Error in api_get_design: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"error": str(e)}, 500
+    # Otherwise fall back to an indexed query on the 'id' field
+    design = search_in_firebase("uniform_designs", "id", design_id, limit=1)
+    if design:
+        logger.debug("Found design by 'id' field")
+        return {"success": True, "data": design[0]}, 200
+    
+    logger.debug("Design not found after all search methods")
+    return {"error": "Design not found"}, 404
 
 
 @app.route("/api/designs/<design_id>", methods=["PUT"])
+@login_required
 def api_update_design(design_id):
     """API endpoint to update a design"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
-    try:
-        data = request.get_json()
-        if not data:
-            return {"error": "No data provided"}, 400
-        
-        # Add approved_date when status is changed to Approved
-        if data.get('status') == 'Approved':
-            from datetime import datetime
-            # Only set approved_date if it's not already set (to preserve original approval date)
-            if 'approved_date' not in data or not data.get('approved_date'):
-                data['approved_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                print(f"[INFO] Setting approved_date for design {design_id}: {data['approved_date']}")
-        
-        # Update design in Firebase
-        success = update_design_in_firebase(design_id, data)
-        if success:
-            # Clear cache to force refresh
-            clear_cache()
-            return {"success": True}, 200
-        else:
-            return {"error": "Failed to update design"}, 500
-    except Exception as e:
-        return {"error": str(e)}, 500
+    data = request.get_json()
+    if not data:
+        return {"error": "No data provided"}, 400
+    
+    # Add approved_date when status is changed to Approved
+    if data.get('status') == 'Approved':
+        # Only set approved_date if it's not already set (to preserve original approval date)
+        if 'approved_date' not in data or not data.get('approved_date'):
+            data['approved_date'] = current_timestamp()
+            logger.info("Setting approved_date for design %s: %s", design_id, data['approved_date'])
+    
+    # Update design in Firebase
+    success = update_design_in_firebase(design_id, data)
+    if success:
+        # Clear cache to force refresh
+        invalidate_cache("uniform_designs", doc_id=design_id)
+        return {"success": True}, 200
+    else:
+        return {"error": "Failed to update design"}, 500
 
 @app.route("/api/designs/<design_id>", methods=["DELETE"])
+@login_required
 def api_delete_design(design_id):
     """API endpoint to delete a design"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
-    try:
-        # Delete design from Firebase
-        success = delete_design_from_firebase(design_id)
-        if success:
-            # Clear cache to force refresh
-            clear_cache()
-            return {"success": True}, 200
-        else:
-            return {"error": "Failed to delete design"}, 500
-    except Exception as e:
-        return {"error": str(e)}, 500
+    # Delete design from Firebase
+    success = delete_design_from_firebase(design_id)
+    if success:
+        # Clear cache to force refresh
+        invalidate_cache("uniform_designs", doc_id=design_id)
+        return {"success": True}, 200
+    else:
+        return {"error": "Failed to delete design"}, 500
 
 
 @app.route("/api/students", methods=["GET", "POST"])
+@login_required
 def api_students():
     """API endpoint to get all students or add a new student"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
     if request.method == "GET":
-        try:
-            # Get all students from Firebase
-            students = get_cached_data("student_list", 100)
-            return {"success": True, "data": students}, 200
-        except Exception as e:
-            print(f"[ERROR] Error fetching students: {e}")
-            return {"error": str(e)}, 500
+        # Get all students from Firebase
+        students = get_cached_data("student_list", 100)
+        return {"success": True, "data": students}, 200
     
     elif request.method == "POST":
-        try:
-            data = request.get_json()
-            
-            # Validate required fields
-            required_fields = ['name', 'student_number', 'course', 'gender', 'email', 'contact_number']
-            for field in required_fields:
-                if not data.get(field):
-                    return {"error": f"{field.replace('_', ' ').title()} is required"}, 400
-            
-            # Prepare student data
-            student_data = {
-                'name': data.get('name', '').strip(),
-                'student_number': data.get('student_number', '').strip(),
-                'course': data.get('course', '').strip(),
-                'gender': data.get('gender', '').strip(),
-                'email': data.get('email', '').strip(),
-                'contact_number': data.get('contact_number', '').strip(),
-                'parent_phone': data.get('parent_phone', '').strip() if data.get('parent_phone') else '',
-                'parent_email': data.get('parent_email', '').strip() if data.get('parent_email') else '',
-                'status': data.get('status', 'Active').strip() if data.get('status') else 'Active'
-            }
-            
-            # Add timestamp
-            from datetime import datetime
-            student_data['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            student_data['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Add to Firebase
-            doc_id = add_to_firebase("student_list", student_data)
-            if doc_id:
-                # Clear cache to force refresh
-                clear_cache()
-                student_data['id'] = doc_id
-                return {"success": True, "data": student_data}, 201
-            else:
-                return {"error": "Failed to add student to database"}, 500
-        except Exception as e:
-            print(f"[ERROR] Error adding student: {e}")
-            import traceback
-            traceback.print_exc()
-            return {"error": str(e)}, 500
+        data = request.get_json()
+        
+        # Validate required fields
+        for field in STUDENT_REQUIRED_FIELDS:
+            if not data.get(field):
+                return {"error": f"{field.replace('_', ' ').title()} is required"}, 400
+        
+        # Prepare student data
+        student_data = {
+            'name': data.get('name', '').strip(),
+            'student_number': data.get('student_number', '').strip(),
+            'course': data.get('course', '').strip(),
+            'gender': data.get('gender', '').strip(),
+            'email': data.get('email', '').strip(),
+            'contact_number': data.get('contact_number', '').strip(),
+            'parent_phone': data.get('parent_phone', '').strip() if data.get('parent_phone') else '',
+            'parent_email': data.get('parent_email', '').strip() if data.get('parent_email') else '',
+            'status': data.get('status', 'Active').strip() if data.get('status') else 'Active'
+        }
+        
+        # Add timestamp
+        student_data['created_at'] = current_timestamp()
+        student_data['updated_at'] = current_timestamp()
+        
+        # Add to Firebase
+        doc_id = add_to_firebase("student_list", student_data)
+        if doc_id:
+            # Clear cache to force refresh
+            invalidate_cache("student_list")
+            student_data['id'] = doc_id
+            return {"success": True, "data": student_data}, 201
+        else:
+            return {"error": "Failed to add student to database"}, 500
 
 
 @app.route("/api/students/<student_id>", methods=["GET", "PUT", "DELETE"])
+@login_required
 def api_student(student_id):
     """API endpoint to get, update, or delete a specific student"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
-    
     if request.method == "GET":
-        try:
-            # Get student from Firebase by document ID
-            if firebase_manager.db:
-                doc_ref = firebase_manager.db.collection("student_list").document(student_id)
-                doc = doc_ref.get()
-                if doc.exists:
-                    student = doc.to_dict()
-                    student['id'] = doc.id
-                    return {"success": True, "data": student}, 200
-                else:
-                    return {"error": "Student not found"}, 404
+        # Get student from Firebase by document ID
+        if firebase_manager.db:
+            doc_ref = firebase_manager.db.collection("student_list").document(student_id)
+            doc = doc_ref.get()
+            if doc.exists:
+                student = doc.to_dict()
+                student['id'] = doc.id
+                return {"success": True, "data": student}, 200
             else:
-                return {"error": "Firebase not initialized"}, 500
-        except Exception as e:
-            print(f"[ERROR] Error fetching student: {e}")
-            import traceback
-            traceback.print_exc()
-            return {"error": str(e)}, 500
+                return {"error": "Student not found"}, 404
+        else:
+            return {"error": "Firebase not initialized"}, 500
     
     elif request.method == "PUT":
-        try:
-            data = request.get_json()
-            
-            # Validate required fields
-            required_fields = ['name', 'student_number', 'course', 'gender', 'email', 'contact_number']
-            for field in required_fields:
-                if not data.get(field):
-                    return {"error": f"{field.replace('_', ' ').title()} is required"}, 400
-            
-            # Prepare student data
-            student_data = {
-                'name': data.get('name', '').strip(),
-                'student_number': data.get('student_number', '').strip(),
-                'course': data.get('course', '').strip(),
-                'gender': data.get('gender', '').strip(),
-                'email': data.get('email', '').strip(),
-                'contact_number': data.get('contact_number', '').strip(),
-                'parent_phone': data.get('parent_phone', '').strip() if data.get('parent_phone') else '',
-                'parent_email': data.get('parent_email', '').strip() if data.get('parent_email') else '',
-                'status': data.get('status', 'Active').strip() if data.get('status') else 'Active'
-            }
-            
-            # Add updated timestamp
-            from datetime import datetime
-            student_data['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Update student in Firebase
-            success = update_in_firebase("student_list", student_id, student_data)
-            if success:
-                # Clear cache to force refresh
-                clear_cache()
-                student_data['id'] = student_id
-                return {"success": True, "data": student_data}, 200
-            else:
-                return {"error": "Failed to update student"}, 500
-        except Exception as e:
-            print(f"[ERROR] Error updating student: {e}")
-            import traceback
-            traceback.print_exc()
-            return {"error": str(e)}, 500
+        data = request.get_json()
+        
+        # Validate required fields
+        for field in STUDENT_REQUIRED_FIELDS:
+            if not data.get(field):
+                return {"error": f"{field.replace('_', ' ').title()} is required"}, 400
+        
+        # Prepare student data
+        student_data = {
+            'name': data.get('name', '').strip(),
+            'student_number': data.get('student_number', '').strip(),
+            'course': data.get('course', '').strip(),
+            'gender': data.get('gender', '').strip(),
+            'email': data.get('email', '').strip(),
+            'contact_number': data.get('contact_number', '').strip(),
+            'parent_phone': data.get('parent_phone', '').strip() if data.get('parent_phone') else '',
+            'parent_email': data.get('parent_email', '').strip() if data.get('parent_email') else '',
+            'status': data.get('status', 'Active').strip() if data.get('status') else 'Active'
+        }
+        
+        # Add updated timestamp
+        student_data['updated_at'] = current_timestamp()
+        
+        # Update student in Firebase
+        success = update_in_firebase("student_list", student_id, student_data)
+        if success:
+            # Clear cache to force refresh
+            invalidate_cache("student_list", doc_id=student_id)
+            student_data['id'] = student_id
+            return {"success": True, "data": student_data}, 200
+        else:
+            return {"error": "Failed to update student"}, 500
     
     elif request.method == "DELETE":
-        try:
-            # Delete student from Firebase
-            success = delete_from_firebase("student_list", student_id)
-            if success:
-                # Clear cache to force refresh
-                clear_cache()
-                return {"success": True}, 200
-            else:
-                return {"error": "Failed to delete student"}, 500
-        except Exception as e:
-            print(f"[ERROR] Error deleting student: {e}")
-            return {"error": str(e)}, 500
-
-
-def require_login():
-    if "user" not in session:
-        return False
-    return True
+        # Delete student from Firebase
+        success = delete_from_firebase("student_list", student_id)
+        if success:
+            # Clear cache to force refresh
+            invalidate_cache("student_list", doc_id=student_id)
+            return {"success": True}, 200
+        else:
+            return {"error": "Failed to delete student"}, 500
 
 
 @app.route("/dashboard")
+@login_required
 def dashboard():
-    if not require_login():
-        return redirect(url_for("login"))
-
-    user = session.get("user")
-    if not user:
-        print("[ERROR] No user in session, redirecting to login")
-        return redirect(url_for("login"))
+    user = g.user
     
-    print(f"[DASHBOARD] Dashboard loading for user: {user.get('username', 'unknown')}")
+    logger.debug("Dashboard loading for user: %s", user.get('username', 'unknown'))
 
     # Use cached data for better performance with fallback
     try:
-        violations = get_cached_data("violations", 20)
-        # Also fetch student violations from student_violations collection
-        student_violations = get_student_violations_from_firebase()
-        # Merge both collections for dashboard display
-        violations = violations + student_violations
-        appeals = get_cached_data("appeals", 20)
-        # Also fetch student violations formatted as appeals from student_violations collection
-        student_violations_appeals = get_student_violations_as_appeals()
-        # Merge both collections for dashboard display
-        appeals = appeals + student_violations_appeals
-        print(f"[STATS] Loaded data - Violations: {len(violations)} (includes {len(student_violations)} from violation_history), Appeals: {len(appeals)} (includes {len(student_violations_appeals)} from violation_history)")
+        # The three reads are independent, so run them concurrently
+        violations_future = _io_pool.submit(get_cached_data, "violations", 20)
+        appeals_future = _io_pool.submit(get_cached_data, "appeals", 20)
+        # violation_history is read once and shown both as violations and as appeals
+        student_violations_future = _io_pool.submit(get_student_violations_and_appeals)
+        violations = violations_future.result()
+        appeals = appeals_future.result()
+        student_violations, student_violations_appeals = student_violations_future.result()
+        logger.debug("Loaded data - Violations: %s (includes %s from violation_history), Appeals: %s (includes %s from violation_history)", len(violations) + len(student_violations), len(student_violations), len(appeals) + len(student_violations_appeals), len(student_violations_appeals))
     except Exception as e:
-        print(f"[WARN] Error loading dashboard data: {e}")
+        logger.warning("Error loading dashboard data: %s", e)
         # Fallback to empty data
         violations = []
+        student_violations = []
         appeals = []
+        student_violations_appeals = []
+
+    # Both collections are shown together; iterate them in place rather than copying into one list
+    recent_violations = list(islice(chain(violations, student_violations), 5))
+    recent_appeals = list(islice(chain(appeals, student_violations_appeals), 5))
 
     # Calculate real statistics
-    total_violations = len(violations)
-    pending_violations = len([v for v in violations if v.get('status') == 'Pending'])
-    total_appeals = len(appeals)
-    pending_appeals = len([a for a in appeals if a.get('status') == 'Pending Review'])
+    total_violations = len(violations) + len(student_violations)
+    pending_violations = sum(1 for v in chain(violations, student_violations) if v.get('status') == VIOLATION_STATUS_PENDING)
+    total_appeals = len(appeals) + len(student_violations_appeals)
 
     # Calculate compliance rate (mock calculation)
     compliance_rate = 94.2 if total_violations == 0 else max(70, 100 - (total_violations * 2))
@@ -2166,49 +2324,36 @@ def dashboard():
         'total_appeals': total_appeals
     }
 
-    print(f"[OK] Dashboard ready for user: {user.get('username', 'unknown')}")
+    logger.debug("Dashboard ready for user: %s", user.get('username', 'unknown'))
     return render_template(
         "guidance_dashboard.html",
         user=user,
-        violations=violations[:5],  # Show only recent 5
-        appeals=appeals[:5],  # Show only recent 5
+        violations=recent_violations,  # Show only recent 5
+        appeals=recent_appeals,  # Show only recent 5
         stats=stats
     )
 
 
 @app.route("/admin-dashboard")
+@login_required
 def admin_dashboard():
     """Admin dashboard showing only uniform designs"""
-    if not require_login():
-        return redirect(url_for("login"))
-
-    user = session.get("user")
-    if not user:
-        print("[ERROR] No user in session, redirecting to login")
-        return redirect(url_for("login"))
+    user = g.user
     
     # Check if user is admin
     if user.get("role", "").lower() != "admin":
         flash("Access denied. Admin access required.", "error")
         return redirect(url_for("dashboard"))
     
-    print(f"[ADMIN DASHBOARD] Dashboard loading for admin: {user.get('username', 'unknown')}")
+    logger.debug("Dashboard loading for admin: %s", user.get('username', 'unknown'))
 
-    # Use cached data for uniform designs and students
+    # Use cached data for uniform designs and students; the two reads are independent, so run them concurrently
+    designs_future = _io_pool.submit(get_cached_data, "uniform_designs", 20)
+    students_future = _io_pool.submit(get_cached_data, "student_list", 100)
     try:
-        designs = get_cached_data("uniform_designs", 20)
-        print(f"[STATS] Loaded data - Designs: {len(designs)}")
-        
-        # Ensure all designs have an 'id' field
-        # If designs come from Firebase, they should have 'id' set by get_documents
-        # But let's make sure and also handle cases where it might be missing
-        for i, design in enumerate(designs):
-            if isinstance(design, dict):
-                if 'id' not in design or not design.get('id'):
-                    # Try to get document ID from Firebase if available
-                    # For now, use a fallback ID
-                    design['id'] = f"design_{i}"
-                    print(f"[WARN] Design at index {i} missing ID, using fallback: {design['id']}")
+        designs = designs_future.result()
+        # get_documents always returns dicts with 'id' set from the document ID
+        logger.debug("Loaded data - Designs: %s", len(designs))
         
         # Sort designs by type: School Uniform first, then House/Casual Shirt
         def sort_key(design):
@@ -2221,31 +2366,26 @@ def admin_dashboard():
                 return 2  # Other types come last
         
         designs = sorted(designs, key=sort_key)
-        print(f"[STATS] Sorted designs by type - School Uniform first, then House/Casual Shirt")
+        logger.debug("Sorted designs by type - School Uniform first, then House/Casual Shirt")
     except Exception as e:
-        print(f"[WARN] Error loading admin dashboard data: {e}")
+        logger.warning("Error loading admin dashboard data: %s", e)
         # Fallback to empty data
         designs = []
 
     # Fetch students from student_list collection
     try:
-        students = get_cached_data("student_list", 100)
-        print(f"[STATS] Loaded data - Students: {len(students)}")
-        
-        # Ensure all students have an 'id' field
-        for i, student in enumerate(students):
-            if isinstance(student, dict):
-                if 'id' not in student or not student.get('id'):
-                    student['id'] = f"student_{i}"
+        students = students_future.result()
+        logger.debug("Loaded data - Students: %s", len(students))
     except Exception as e:
-        print(f"[WARN] Error loading students data: {e}")
+        logger.warning("Error loading students data: %s", e)
         students = []
 
     # Calculate statistics for designs and students
     total_designs = len(designs)
-    approved_designs = len([d for d in designs if d.get('status') == 'Approved'])
-    pending_designs = len([d for d in designs if d.get('status') == 'Under Review' or d.get('status') == 'Pending Review'])
-    rejected_designs = len([d for d in designs if d.get('status') == 'Rejected'])
+    design_status_counts = Counter(d.get('status') for d in designs)
+    approved_designs = design_status_counts['Approved']
+    pending_designs = design_status_counts[DESIGN_STATUS_UNDER_REVIEW] + design_status_counts['Pending Review']
+    rejected_designs = design_status_counts['Rejected']
     total_students = len(students)
 
     stats = {
@@ -2256,10 +2396,10 @@ def admin_dashboard():
         'total_students': total_students
     }
 
-    print(f"[OK] Admin dashboard ready for user: {user.get('username', 'unknown')}")
+    logger.debug("Admin dashboard ready for user: %s", user.get('username', 'unknown'))
     # Debug: print first design's ID if available
-    if designs and len(designs) > 0:
-        print(f"[DEBUG] First design ID: {designs[0].get('id', 'NO ID')}")
+    if designs:
+        logger.debug("First design ID: %s", designs[0].get('id', 'NO ID'))
     
     return render_template(
         "admin_dashboard.html",
@@ -2277,72 +2417,142 @@ def logout():
     return redirect(url_for("login"))
 
 
-@app.route("/api/health")
-def health_check():
-    """Health check endpoint to verify Firebase and other services"""
-    health_status = {
-        "status": "healthy",
-        "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
-        "services": {}
-    }
-    
-    # Check Firebase connection
+# Configuration variables reported by /api/health; they don't change after startup,
+# so the (masked) values are read once at import
+_HEALTH_ENV_VARS = {
+    "FIREBASE_PROJECT_ID": os.getenv("FIREBASE_PROJECT_ID"),
+    "FIREBASE_PRIVATE_KEY": "***" if os.getenv("FIREBASE_PRIVATE_KEY") else None,
+    "FIREBASE_CLIENT_EMAIL": os.getenv("FIREBASE_CLIENT_EMAIL"),
+    "CLOUDINARY_CLOUD_NAME": os.getenv("CLOUDINARY_CLOUD_NAME"),
+    "CLOUDINARY_API_KEY": "***" if os.getenv("CLOUDINARY_API_KEY") else None,
+    "SECRET_KEY": "***" if os.getenv("SECRET_KEY") else None,
+}
+HEALTH_ENVIRONMENT = {
+    "variables_set": sum(1 for v in _HEALTH_ENV_VARS.values() if v is not None),
+    "total_variables": len(_HEALTH_ENV_VARS),
+    "variables": _HEALTH_ENV_VARS
+}
+
+HEALTH_HEARTBEAT_SECONDS = 10  # how often the background heartbeat re-checks the services
+HEALTH_STALE_SECONDS = 3 * HEALTH_HEARTBEAT_SECONDS  # older results mean the heartbeat isn't running
+HEALTH_CHECK_TIMEOUT = 2  # seconds to wait for each service check
+_health_cache = (0.0, None, b'')  # (checked_at, full status, pre-encoded probe body)
+_health_lock = Lock()
+# One worker per service check, so the checks never queue behind request reads on _io_pool
+_health_pool = ThreadPoolExecutor(max_workers=2)
+
+
+def check_firebase():
+    """Check the Firestore connection for /api/health"""
     try:
         if firebase_manager.db:
             # Test Firebase by trying to get a document
             test_docs = firebase_manager.get_documents("violations", limit=1)
-            health_status["services"]["firebase"] = {
+            return {
                 "status": "connected",
                 "message": f"Successfully connected to Firestore. Found {len(test_docs)} test documents."
             }
-        else:
-            health_status["services"]["firebase"] = {
-                "status": "disconnected",
-                "message": "Firebase not initialized. Check credentials."
-            }
-            health_status["status"] = "unhealthy"
+        return {
+            "status": "disconnected",
+            "message": "Firebase not initialized. Check credentials."
+        }
     except Exception as e:
-        health_status["services"]["firebase"] = {
+        return {
             "status": "error",
             "message": f"Firebase connection error: {str(e)}"
         }
-        health_status["status"] = "unhealthy"
-    
-    # Check Cloudinary connection
+
+
+def check_cloudinary():
+    """Check the Cloudinary configuration for /api/health"""
     try:
-        from cloudinary_config import cloudinary
         if cloudinary:
-            health_status["services"]["cloudinary"] = {
+            return {
                 "status": "connected",
                 "message": "Cloudinary configuration loaded successfully."
             }
-        else:
-            health_status["services"]["cloudinary"] = {
-                "status": "disconnected",
-                "message": "Cloudinary not configured."
-            }
+        return {
+            "status": "disconnected",
+            "message": "Cloudinary not configured."
+        }
     except Exception as e:
-        health_status["services"]["cloudinary"] = {
+        return {
             "status": "error",
             "message": f"Cloudinary error: {str(e)}"
         }
+
+
+def check_services():
+    """Run the Firebase and Cloudinary checks behind /api/health"""
+    health_status = {
+        "status": "healthy",
+        "timestamp": current_timestamp(),
+        "services": {}
+    }
     
-    # Check environment variables
-    import os
-    env_vars = {
-        "FIREBASE_PROJECT_ID": os.getenv("FIREBASE_PROJECT_ID"),
-        "FIREBASE_PRIVATE_KEY": "***" if os.getenv("FIREBASE_PRIVATE_KEY") else None,
-        "FIREBASE_CLIENT_EMAIL": os.getenv("FIREBASE_CLIENT_EMAIL"),
-        "CLOUDINARY_CLOUD_NAME": os.getenv("CLOUDINARY_CLOUD_NAME"),
-        "CLOUDINARY_API_KEY": "***" if os.getenv("CLOUDINARY_API_KEY") else None,
-        "SECRET_KEY": "***" if os.getenv("SECRET_KEY") else None,
+    # Run the service checks concurrently so the probe takes as long as the slowest one
+    checks = {
+        "firebase": _health_pool.submit(check_firebase),
+        "cloudinary": _health_pool.submit(check_cloudinary),
     }
+    for service, future in checks.items():
+        try:
+            health_status["services"][service] = future.result(timeout=HEALTH_CHECK_TIMEOUT)
+        except Exception as e:
+            health_status["services"][service] = {
+                "status": "error",
+                "message": f"{service.title()} check timed out or failed: {str(e)}"
+            }
     
-    health_status["environment"] = {
-        "variables_set": sum(1 for v in env_vars.values() if v is not None),
-        "total_variables": len(env_vars),
-        "variables": env_vars
+    # Firebase is required; Cloudinary only affects image uploads
+    if health_status["services"]["firebase"]["status"] != "connected":
+        health_status["status"] = "unhealthy"
+    
+    return health_status
+
+
+def health_snapshot():
+    """Run the service checks and encode the default /api/health body once for every probe that reads it"""
+    health_status = check_services()
+    summary = {
+        "status": health_status["status"],
+        "timestamp": health_status["timestamp"],
+        "services": {service: check["status"] for service, check in health_status["services"].items()}
     }
+    return time.monotonic(), health_status, json.dumps(summary).encode()
+
+
+def health_heartbeat():
+    """Re-check the services every HEALTH_HEARTBEAT_SECONDS so /api/health only reads the last result"""
+    global _health_cache
+    while True:
+        try:
+            _health_cache = health_snapshot()
+        except Exception as e:
+            logger.exception("Health heartbeat failed: %s", e)
+        time.sleep(HEALTH_HEARTBEAT_SECONDS)
+
+
+@app.route("/api/health")
+def health_check():
+    """Health check endpoint to verify Firebase and other services"""
+    global _health_cache
+    # Normally the heartbeat keeps this fresh; check inline only before its first run or if it has stopped
+    checked_at, cached_status, summary_body = _health_cache
+    if cached_status is None or time.monotonic() - checked_at >= HEALTH_STALE_SECONDS:
+        with _health_lock:
+            checked_at, cached_status, summary_body = _health_cache
+            if cached_status is None or time.monotonic() - checked_at >= HEALTH_STALE_SECONDS:
+                _health_cache = health_snapshot()
+                checked_at, cached_status, summary_body = _health_cache
+    status_code = 200 if cached_status["status"] == "healthy" else 500
+    
+    # Probes only need the status, already encoded; the service messages, environment and cache details are opt-in
+    if request.args.get("verbose") != "1":
+        return Response(summary_body, status=status_code, mimetype="application/json")
+    
+    health_status = dict(cached_status)
+    health_status["environment"] = HEALTH_ENVIRONMENT
     
     # Check cache status
     health_status["cache"] = {
@@ -2350,179 +2560,141 @@ def health_check():
         "status": "active" if _cache else "empty"
     }
     
-    return health_status, 200 if health_status["status"] == "healthy" else 500
+    return health_status, status_code
 
 
 @app.route("/api/test-violation", methods=["POST"])
+@login_required
 def test_violation_creation():
     """Test endpoint to create a violation for debugging Railway deployment"""
-    if not session.get("user"):
-        return {"error": "Unauthorized"}, 401
+    if not ENABLE_TEST_ENDPOINTS:
+        return {"error": "Not found"}, 404
+    logger.info("Testing violation creation on Railway")
+    
+    # Create a test violation (date and timestamp come from one clock read)
+    timestamp = current_timestamp()
+    test_data = {
+        "student_name": "Test Student",
+        "student_id": "TEST001",
+        "violation_type": "Test Violation",
+        "course": "Test Grade",
+        "description": "This is a test violation for debugging Railway deployment",
+        "date": timestamp[:10],
+        "reported_by": g.user.get("name", "Test User"),
+        "severity": "Low",
+        "created_timestamp": timestamp
+    }
     
-    try:
-        print(f"[TEST] Testing violation creation on Railway")
-        
-        # Create a test violation
-        test_data = {
-            "student_name": "Test Student",
-            "student_id": "TEST001",
-            "violation_type": "Test Violation",
-            "course": "Test Grade",
-            "description": "This is a test violation for debugging Railway deployment",
-            "date": time.strftime('%Y-%m-%d'),
-            "reported_by": session.get("user", {}).get("name", "Test User"),
-            "severity": "Low",
-            "created_timestamp": time.strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        print(f"[TEST] Test data: {test_data}")
-        
-        # Check Firebase connection
-        if not firebase_manager.db:
-            return {"error": "Firebase not connected", "debug": "firebase_not_initialized"}, 500
-        
-        # Try to add the test violation
-        doc_id = add_to_firebase("violations", test_data)
-        
-        if doc_id:
-            print(f"[TEST] Test violation created successfully with ID: {doc_id}")
-            return {
-                "success": True, 
-                "message": "Test violation created successfully",
-                "violation_id": doc_id,
-                "test_data": test_data
-            }, 201
-        else:
-            print(f"[TEST] Failed to create test violation")
-            return {"error": "Failed to create test violation", "debug": "add_to_firebase_returned_none"}, 500
-            
-    except Exception as e:
-        print(f"[TEST] Test violation creation failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"error": f"Test failed: {str(e)}", "debug": "test_exception"}, 500
+    logger.info("Test data: %s", test_data)
+    
+    # Check Firebase connection
+    if not firebase_manager.db:
+        return {"error": "Firebase not connected", "debug": "firebase_not_initialized"}, 500
+    
+    # Try to add the test violation
+    doc_id = add_to_firebase("violations", test_data)
+    
+    if doc_id:
+        logger.info("Test violation created successfully with ID: %s", doc_id)
+        return {
+            "success": True, 
+            "message": "Test violation created successfully",
+            "violation_id": doc_id,
+            "test_data": test_data
+        }, 201
+    else:
+        logger.warning("Failed to create test violation")
+        return {"error": "Failed to create test violation", "debug": "add_to_firebase_returned_none"}, 500
 
 
 # ============ Feature pages ============
 
 @app.route("/violations", methods=["GET", "POST"])
+@login_required
 def violations_page():
-    if not require_login():
-        return redirect(url_for("login"))
-
     if request.method == "POST":
-        data = {
-            "student_name": request.form.get("student_name", "").strip(),
-            "student_id": request.form.get("student_id", "").strip(),
-            "violation_type": request.form.get("violation_type", "").strip(),
-            "course": request.form.get("course", "").strip(),
-            "date": request.form.get("date", "").strip(),
-            "description": request.form.get("description", "").strip(),
-            "status": "Pending",  # Will be calculated based on count
-            "reported_by": session.get("user", {}).get("name", "Guidance"),
-        }
+        data, missing = collect_form(VIOLATION_FORM_FIELDS, required=VIOLATION_REQUIRED_FIELDS)
+        data["reported_by"] = g.user_name
         
-        # Determine status based on violation count for this student
-        student_name = data.get("student_name", "")
-        student_id = data.get("student_id", "")
-        if student_name and student_id:
-            data["status"] = get_violation_status_by_count(student_name, student_id)
-        
-        if not data["student_name"] or not data["student_id"] or not data["violation_type"]:
+        if missing:
             flash("Student, ID and Type are required", "error")
         else:
+            # Determine status based on violation count for this student
+            data["status"] = get_violation_status_by_count(data["student_name"], data["student_id"])
+            data["description_hash"] = description_hash(data["description"])
             doc_id = add_to_firebase("violations", data)
             if doc_id:
-                clear_cache()  # Clear cache when data changes
+                invalidate_cache("violations")  # Clear cache when data changes
                 flash(f"Violation saved (ID: {doc_id})", "success")
             else:
                 flash("Failed to save violation", "error")
         return redirect(url_for("violations_page"))
 
-    # Get violations from both collections
-    violations_items = get_from_firebase("violations") or []
-    student_violations_items = get_student_violations_from_firebase()
-    
-    # Merge both collections
-    items = violations_items + student_violations_items
+    # Get violations from both collections concurrently; the collection read goes through the TTL
+    # cache, which the write paths above invalidate
+    violations_future = _io_pool.submit(get_cached_data, "violations", 100)
+    student_violations_future = _io_pool.submit(get_student_violations_from_firebase)
+    violations_items = violations_future.result() or []
+    student_violations_items = student_violations_future.result()
+    remember_documents("violations", violations_items)
     
-    # Add document IDs to items for action buttons
-    for i, item in enumerate(items):
-        if 'id' not in item:
-            item['id'] = f"violation_{i}"  # Fallback ID if not available
+    # Merge both collections, dropping records mirrored in both (the template needs a list for |length)
+    items = merge_unique(violations_items, student_violations_items, link_field="violation_id")
     
-    print(f"[INFO] Total violations displayed: {len(items)} (from violations: {len(violations_items)}, from violation_history: {len(student_violations_items)})")
-    return render_template("violations.html", user=session.get("user"), items=items)
+    logger.info("Total violations displayed: %s (from violations: %s, from violation_history: %s)", len(items), len(violations_items), len(student_violations_items))
+    return render_template("violations.html", user=g.user, items=items)
 
 
 @app.route("/violations/view/<violation_id>")
+@login_required
 def view_violation(violation_id):
-    if not require_login():
-        return redirect(url_for("login"))
-    
     # Get violation details from Firebase
-    violation = search_in_firebase("violations", "id", violation_id)
+    violation = get_document_cached("violations", violation_id)
     if not violation:
         flash("Violation not found", "error")
         return redirect(url_for("violations_page"))
     
-    return render_template("violation_details.html", violation=violation[0], user=session.get("user"))
+    return render_template("violation_details.html", violation=violation, user=g.user)
 
 
 @app.route("/violations/edit/<violation_id>", methods=["GET", "POST"])
+@login_required
 def edit_violation(violation_id):
-    if not require_login():
-        return redirect(url_for("login"))
-    
     if request.method == "POST":
         # Update violation data
-        data = {
-            "student_name": request.form.get("student_name", "").strip(),
-            "student_id": request.form.get("student_id", "").strip(),
-            "violation_type": request.form.get("violation_type", "").strip(),
-            "course": request.form.get("course", "").strip(),
-            "date": request.form.get("date", "").strip(),
-            "description": request.form.get("description", "").strip(),
-            "status": "Pending",  # Will be calculated based on count
-            "reported_by": session.get("user", {}).get("name", "Guidance"),
-        }
-        
-        # Determine status based on violation count for this student
-        student_name = data.get("student_name", "")
-        student_id = data.get("student_id", "")
-        if student_name and student_id:
-            data["status"] = get_violation_status_by_count(student_name, student_id)
+        data, missing = collect_form(VIOLATION_FORM_FIELDS, required=VIOLATION_REQUIRED_FIELDS)
+        data["reported_by"] = g.user_name
         
-        if not data["student_name"] or not data["student_id"] or not data["violation_type"]:
+        if missing:
             flash("Student, ID and Type are required", "error")
         else:
+            # Determine status based on violation count for this student
+            data["status"] = get_violation_status_by_count(data["student_name"], data["student_id"])
             # Update in Firebase
             success = update_violation_in_firebase(violation_id, data)
             if success:
-                clear_cache()  # Clear cache when data changes
+                invalidate_cache("violations", doc_id=violation_id)  # Clear cache when data changes
                 flash("Violation updated successfully", "success")
             else:
                 flash("Failed to update violation", "error")
         return redirect(url_for("violations_page"))
     
     # Get violation details for editing
-    violation = search_in_firebase("violations", "id", violation_id)
+    violation = get_document_cached("violations", violation_id)
     if not violation:
         flash("Violation not found", "error")
         return redirect(url_for("violations_page"))
     
-    return render_template("edit_violation.html", violation=violation[0], user=session.get("user"))
+    return render_template("edit_violation.html", violation=violation, user=g.user)
 
 
 @app.route("/violations/delete/<violation_id>", methods=["POST"])
+@login_required
 def delete_violation(violation_id):
-    if not require_login():
-        return redirect(url_for("login"))
-    
     # Delete violation from Firebase
     success = delete_violation_from_firebase(violation_id)
     if success:
-        clear_cache()  # Clear cache when data changes
+        invalidate_cache("violations", "student_violations", doc_id=violation_id)  # Clear cache when data changes
         flash("Violation deleted successfully", "success")
     else:
         flash("Failed to delete violation", "error")
@@ -2531,116 +2703,91 @@ def delete_violation(violation_id):
 
 
 @app.route("/appeals", methods=["GET", "POST"])
+@login_required
 def appeals_page():
-    if not require_login():
-        return redirect(url_for("login"))
-
     if request.method == "POST":
-        data = {
-            "student_name": request.form.get("student_name", "").strip(),
-            "student_id": request.form.get("student_id", "").strip(),
-            "violation_id": request.form.get("violation_id", "").strip(),
-            "appeal_date": request.form.get("appeal_date", "").strip(),
-            "reason": request.form.get("reason", "").strip(),
-            "status": request.form.get("status", "Pending Review"),
-            "submitted_by": request.form.get("submitted_by", "").strip(),
-            "priority": request.form.get("priority", "Medium"),
-        }
-        if not data["student_name"] or not data["student_id"] or not data["violation_id"]:
+        data, missing = collect_form(APPEAL_FORM_FIELDS, required=APPEAL_REQUIRED_FIELDS, defaults=APPEAL_FORM_DEFAULTS)
+        if missing:
             flash("Student, ID and Violation ID are required", "error")
         else:
             # Add appeal to student_appeals collection (primary collection)
             doc_id = add_student_appeal_to_firebase(data)
             if doc_id:
-                clear_cache()  # Clear cache when data changes
+                invalidate_cache("student_appeals")  # Clear cache when data changes
                 flash(f"Appeal saved (ID: {doc_id})", "success")
             else:
                 # Fallback to legacy appeals collection
                 doc_id = add_to_firebase("appeals", data)
                 if doc_id:
-                    clear_cache()
+                    invalidate_cache("appeals")
                     flash(f"Appeal saved (ID: {doc_id})", "success")
                 else:
                     flash("Failed to save appeal", "error")
         return redirect(url_for("appeals_page"))
 
-    # Get appeals from all collections
-    student_appeals_items = get_student_appeals_from_firebase()
-    legacy_appeals_items = get_from_firebase("appeals") or []
-    student_violations_appeals = get_student_violations_as_appeals()
+    # Get appeals from all collections concurrently
+    student_appeals_future = _io_pool.submit(get_student_appeals_from_firebase)
+    legacy_appeals_future = _io_pool.submit(get_cached_data, "appeals", 100)
+    student_violations_appeals_future = _io_pool.submit(get_student_violations_as_appeals)
+    student_appeals_items = student_appeals_future.result()
+    legacy_appeals_items = legacy_appeals_future.result() or []
+    student_violations_appeals = student_violations_appeals_future.result()
+    remember_documents("appeals", legacy_appeals_items)
     
-    # Merge all collections (student_appeals takes priority)
-    items = student_appeals_items + legacy_appeals_items + student_violations_appeals
+    # Merge all collections, dropping duplicates (student_appeals takes priority)
+    items = merge_unique(student_appeals_items, legacy_appeals_items, student_violations_appeals)
     
-    # Add document IDs to items for action buttons
-    for i, item in enumerate(items):
-        if 'id' not in item:
-            item['id'] = f"appeal_{i}"  # Fallback ID if not available
-    
-    print(f"[INFO] Total appeals displayed: {len(items)} (from student_appeals: {len(student_appeals_items)}, from appeals: {len(legacy_appeals_items)}, from violation_history: {len(student_violations_appeals)})")
-    return render_template("appeals.html", user=session.get("user"), items=items)
+    logger.info("Total appeals displayed: %s (from student_appeals: %s, from appeals: %s, from violation_history: %s)", len(items), len(student_appeals_items), len(legacy_appeals_items), len(student_violations_appeals))
+    return render_template("appeals.html", user=g.user, items=items)
 
 
 @app.route("/appeals/view/<appeal_id>")
+@login_required
 def view_appeal(appeal_id):
-    if not require_login():
-        return redirect(url_for("login"))
-    
     # Get appeal details from Firebase
-    appeal = search_in_firebase("appeals", "id", appeal_id)
+    appeal = get_document_cached("appeals", appeal_id)
     if not appeal:
         flash("Appeal not found", "error")
         return redirect(url_for("appeals_page"))
     
-    return render_template("appeal_details.html", appeal=appeal[0], user=session.get("user"))
+    return render_template("appeal_details.html", appeal=appeal, user=g.user)
 
 
 @app.route("/appeals/edit/<appeal_id>", methods=["GET", "POST"])
+@login_required
 def edit_appeal(appeal_id):
-    if not require_login():
-        return redirect(url_for("login"))
-    
     if request.method == "POST":
         # Update appeal data
-        data = {
-            "student_name": request.form.get("student_name", "").strip(),
-            "student_id": request.form.get("student_id", "").strip(),
-            "violation_id": request.form.get("violation_id", "").strip(),
-            "appeal_date": request.form.get("appeal_date", "").strip(),
-            "reason": request.form.get("reason", "").strip(),
-            "status": request.form.get("status", "Pending Review"),
-            "submitted_by": request.form.get("submitted_by", "").strip(),
-            "priority": request.form.get("priority", "Medium"),
-        }
+        data, missing = collect_form(APPEAL_FORM_FIELDS, required=APPEAL_REQUIRED_FIELDS, defaults=APPEAL_FORM_DEFAULTS)
         
-        if not data["student_name"] or not data["student_id"] or not data["violation_id"]:
+        if missing:
             flash("Student, ID and Violation ID are required", "error")
         else:
             # Update in Firebase
             success = update_appeal_in_firebase(appeal_id, data)
             if success:
+                invalidate_cache("student_appeals", "appeals", doc_id=appeal_id)  # Clear cache when data changes
                 flash("Appeal updated successfully", "success")
             else:
                 flash("Failed to update appeal", "error")
         return redirect(url_for("appeals_page"))
     
     # Get appeal details for editing
-    appeal = search_in_firebase("appeals", "id", appeal_id)
+    appeal = get_document_cached("appeals", appeal_id)
     if not appeal:
         flash("Appeal not found", "error")
         return redirect(url_for("appeals_page"))
     
-    return render_template("edit_appeal.html", appeal=appeal[0], user=session.get("user"))
+    return render_template("edit_appeal.html", appeal=appeal, user=g.user)
 
 
 @app.route("/appeals/delete/<appeal_id>", methods=["POST"])
+@login_required
 def delete_appeal(appeal_id):
-    if not require_login():
-        return redirect(url_for("login"))
-    
     # Delete appeal from Firebase
     success = delete_appeal_from_firebase(appeal_id)
     if success:
+        invalidate_cache("student_appeals", "appeals", doc_id=appeal_id)  # Clear cache when data changes
         flash("Appeal deleted successfully", "success")
     else:
         flash("Failed to delete appeal", "error")
@@ -2649,111 +2796,69 @@ def delete_appeal(appeal_id):
 
 
 @app.route("/designs", methods=["GET", "POST"])
+@login_required
 def designs_page():
-    if not require_login():
-        return redirect(url_for("login"))
-
     if request.method == "POST":
-        name = request.form.get("name", "").strip()
-        typ = request.form.get("type", "").strip()
-        course = request.form.get("course", "").strip()
-        colors = request.form.get("colors", "").strip()
-        submitted_date = request.form.get("submitted_date", "").strip()
-        status = request.form.get("status", "Under Review")
-        designer = request.form.get("designer", "").strip()
-        description = request.form.get("description", "").strip()
+        data, missing = collect_form(DESIGN_FORM_FIELDS, required=DESIGN_REQUIRED_FIELDS, defaults=DESIGN_FORM_DEFAULTS)
+
+        if missing:
+            flash("Design name and type are required", "error")
+            return redirect(url_for("designs_page"))
 
         image_url = ""
         file = request.files.get("image")
         if file and file.filename:
             try:
-                suffix = os.path.splitext(file.filename)[1]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    file.save(tmp.name)
-                    tmp_path = tmp.name
-                
-                # Upload to Cloudinary
-                public_id = f"design_{name.replace(' ', '_')}_{os.path.basename(tmp_path)}"
-                image_url = upload_image_to_cloudinary(tmp_path, public_id)
+                # Stream the upload straight to Cloudinary without a temp file
+                public_id = f"design_{slugify(data['name'])}_{uuid.uuid4().hex[:8]}"
+                image_url = upload_image_to_cloudinary(file.stream, public_id)
                 
                 if not image_url:
-                    print("[WARN] Image upload failed - design will be saved without image")
+                    logger.warning("Image upload failed - design will be saved without image")
                     flash("Image upload failed - design saved without image", "warning")
             except Exception as e:
-                print(f"Error uploading image: {e}")
+                logger.warning("Error uploading image: %s", e)
                 image_url = ""
                 flash("Error uploading image - design saved without image", "warning")
-            finally:
-                try:
-                    os.unlink(tmp_path)
-                except Exception:
-                    pass
 
-        data = {
-            "name": name,
-            "type": typ,
-            "course": course,
-            "colors": colors,
-            "submitted_date": submitted_date,
-            "status": status,
-            "designer": designer,
-            "description": description,
-            "image_url": image_url,
-        }
+        data["image_url"] = image_url
         
         # Perform uniqueness analysis
         uniqueness_analysis = analyze_design_uniqueness(data)
         data["uniqueness_analysis"] = uniqueness_analysis
-        if not name or not typ:
-            flash("Design name and type are required", "error")
+        doc_id = add_to_firebase("uniform_designs", data)
+        if doc_id:
+            invalidate_cache("uniform_designs")  # Clear cache when data changes
+            analysis_score = uniqueness_analysis['overall_score']
+            analysis_assessment = uniqueness_analysis['overall_assessment']
+            flash(f"Design saved (ID: {doc_id}) - Uniqueness: {analysis_score}% ({analysis_assessment})", "success")
         else:
-            doc_id = add_to_firebase("uniform_designs", data)
-            if doc_id:
-                clear_cache()  # Clear cache when data changes
-                analysis_score = uniqueness_analysis['overall_score']
-                analysis_assessment = uniqueness_analysis['overall_assessment']
-                flash(f"Design saved (ID: {doc_id}) - Uniqueness: {analysis_score}% ({analysis_assessment})", "success")
-            else:
-                flash("Failed to save design", "error")
+            flash("Failed to save design", "error")
         return redirect(url_for("designs_page"))
 
-    items = get_from_firebase("uniform_designs") or []
-    # Add document IDs to items for action buttons
-    for i, item in enumerate(items):
-        if 'id' not in item:
-            item['id'] = f"design_{i}"  # Fallback ID if not available
-    return render_template("designs.html", user=session.get("user"), items=items)
+    items = get_cached_data("uniform_designs", 100)
+    remember_documents("uniform_designs", items)
+    return render_template("designs.html", user=g.user, items=items)
 
 
 @app.route("/designs/view/<design_id>")
+@login_required
 def view_design(design_id):
-    if not require_login():
-        return redirect(url_for("login"))
-    
     # Get design details from Firebase
-    design = search_in_firebase("uniform_designs", "id", design_id)
+    design = get_document_cached("uniform_designs", design_id)
     if not design:
         flash("Design not found", "error")
         return redirect(url_for("designs_page"))
     
-    return render_template("design_details.html", design=design[0], user=session.get("user"))
+    return render_template("design_details.html", design=design, user=g.user)
 
 
 @app.route("/designs/edit/<design_id>", methods=["GET", "POST"])
+@login_required
 def edit_design(design_id):
-    if not require_login():
-        return redirect(url_for("login"))
-    
     if request.method == "POST":
         # Update design data
-        name = request.form.get("name", "").strip()
-        typ = request.form.get("type", "").strip()
-        course = request.form.get("course", "").strip()
-        colors = request.form.get("colors", "").strip()
-        submitted_date = request.form.get("submitted_date", "").strip()
-        status = request.form.get("status", "Under Review")
-        designer = request.form.get("designer", "").strip()
-        description = request.form.get("description", "").strip()
+        data, missing = collect_form(DESIGN_FORM_FIELDS, required=DESIGN_REQUIRED_FIELDS, defaults=DESIGN_FORM_DEFAULTS)
         
         # Handle image upload if provided
         image_url = ""
@@ -2761,71 +2866,49 @@ def edit_design(design_id):
             img = request.files["image"]
             if img and img.filename:
                 try:
-                    # Save to temporary file
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_file:
-                        img.save(tmp_file.name)
-                        tmp_path = tmp_file.name
-                    
-                    # Upload to Cloudinary
-                    public_id = f"design_{design_id}_{int(time.time())}"
-                    image_url = upload_image_to_cloudinary(tmp_path, public_id)
+                    # Stream the upload straight to Cloudinary without a temp file
+                    public_id = f"design_{design_id}_{uuid.uuid4().hex[:8]}"
+                    image_url = upload_image_to_cloudinary(img.stream, public_id)
                     
                     if not image_url:
-                        print("[WARN] Image upload failed - keeping existing image")
+                        logger.warning("Image upload failed - keeping existing image")
                         flash("Image upload failed - keeping existing image", "warning")
-                    
-                    # Clean up temporary file
-                    try:
-                        os.unlink(tmp_path)
-                    except Exception:
-                        pass
                 except Exception as e:
-                    print(f"Error uploading image: {e}")
+                    logger.warning("Error uploading image: %s", e)
                     flash("Error uploading image - keeping existing image", "warning")
         
-        data = {
-            "name": name,
-            "type": typ,
-            "course": course,
-            "colors": colors,
-            "submitted_date": submitted_date,
-            "status": status,
-            "designer": designer,
-            "description": description,
-        }
-        
         # Only update image_url if a new image was uploaded
         if image_url:
             data["image_url"] = image_url
         
-        if not name or not typ:
+        if missing:
             flash("Design name and type are required", "error")
         else:
             # Update in Firebase
             success = update_design_in_firebase(design_id, data)
             if success:
+                invalidate_cache("uniform_designs", doc_id=design_id)  # Clear cache when data changes
                 flash("Design updated successfully", "success")
             else:
                 flash("Failed to update design", "error")
         return redirect(url_for("designs_page"))
     
     # Get design details for editing
-    design = search_in_firebase("uniform_designs", "id", design_id)
+    design = get_document_cached("uniform_designs", design_id)
     if not design:
         flash("Design not found", "error")
         return redirect(url_for("designs_page"))
     
-    return render_template("edit_design.html", design=design[0], user=session.get("user"))
+    return render_template("edit_design.html", design=design, user=g.user)
 
 
 @app.route("/designs/delete/<design_id>", methods=["POST"])
+@login_required
 def delete_design(design_id):
-    if not require_login():
-        return redirect(url_for("login"))
-    
     # Delete design from Firebase
     success = delete_design_from_firebase(design_id)
     if success:
+        invalidate_cache("uniform_designs", doc_id=design_id)  # Clear cache when data changes
         flash("Design deleted successfully", "success")
     else:
         flash("Failed to delete design", "error")
@@ -2834,36 +2917,37 @@ def delete_design(design_id):
 
 
 if __name__ == "__main__":
-    import socket
-    import os
-    
     # Get configuration from environment variables or use defaults
     host = os.environ.get('FLASK_HOST', '0.0.0.0')
     port = int(os.environ.get('PORT', os.environ.get('FLASK_PORT', 5000)))
     debug = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
     
+    # Debug-level request tracing is only emitted when running with FLASK_DEBUG
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO, format="[%(levelname)s] %(message)s")
+    
     # Production mode detection
     is_production = os.environ.get('ENVIRONMENT') == 'production' or os.environ.get('RAILWAY_ENVIRONMENT') == 'production'
     
-    # Get local IP address function
-    def get_local_ip():
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-            return local_ip
-        except Exception:
-            return "127.0.0.1"
-    
     if is_production:
-        # Production settings
-        app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-here')
+        # Production settings (deployments run under gunicorn, see gunicorn.conf.py)
         debug = False
         print(f"\n[START] AI-niform Server - Production Mode")
         print(f"🌐 Live at: https://your-railway-domain.railway.app")
     else:
-        # Development settings
+        # Development settings; the LAN address is only needed for the banner, so
+        # production never opens the probe socket
+        import socket
+        
+        def get_local_ip():
+            try:
+                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                s.connect(("8.8.8.8", 80))
+                local_ip = s.getsockname()[0]
+                s.close()
+                return local_ip
+            except Exception:
+                return "127.0.0.1"
+        
         local_ip = get_local_ip()
         print(f"\n[START] AI-niform Server - Development Mode")
         print(f"[HOST] Host: {host}")
@@ -2880,6 +2964,9 @@ if __name__ == "__main__":
         print(f"   2. Use your public IP address")
         print(f"\n[STOP] Press Ctrl+C to stop the server\n")
     
+    start_background_tasks()
+    _io_pool.submit(run_migrations)
+    
     # Run the server
     app.run(host=host, port=port, debug=debug, threaded=True)
 